@@ -4,7 +4,37 @@ import requests
 from frappe import _
 from frappe.utils import now_datetime, get_datetime
 
+from migration_portal.migration_portal.utils.event_ordering import (
+    get_event_timestamp, is_stale_event, record_applied_version, stale_response
+)
+from migration_portal.migration_portal.utils.idempotency import (
+    get_idempotency_key, claim_event, release_event, duplicate_response
+)
+from migration_portal.migration_portal.utils.payload_codec import encode_payload
+from migration_portal.migration_portal.utils.sync_metrics import timed
+from migration_portal.migration_portal.utils.sync_log_buffer import (
+    get_buffer_config, buffer_sync_log, prepare_sync_log_row, insert_sync_log_rows
+)
+from migration_portal.migration_portal.utils.webhook_auth import verify_token
+from migration_portal.migration_portal.utils.webhook_inbox import is_deferred_mode, store_webhook_event
+
+# Map FlyOut status to our status (Adjust as per actual FlyOut statuses)
+FLYOUT_STATUS_MAP = {
+    "Cancelled": "Rejected",
+    "Closed": "Rejected", # Assuming Closed means rejected from FlyOut perspective
+    "Active": "Under Review" # Assuming Active maps to Under Review
+    # Add more mappings as needed based on FlyOut's status lifecycle
+}
+
+# Fields every FlyOut inquiry payload must carry
+INQUIRY_REQUIRED_FIELDS = ["inquiry_id", "applicant_name", "email", "phone", "service_type"]
+
+# Number of inquiries applied per transaction by the bulk endpoint
+BULK_CHUNK_SIZE = 200
+
+
 @frappe.whitelist(allow_guest=True)
+@timed("receive_inquiry")
 def receive_inquiry(data=None, token=None):
     """
     Endpoint to receive new inquiry data from FlyOut
@@ -30,82 +60,55 @@ def receive_inquiry(data=None, token=None):
         data = json.loads(data)
     
     # Validate required fields
-    required_fields = ["inquiry_id", "applicant_name", "email", "phone", "service_type"]
-    for field in required_fields:
-        if field not in data:
-            # Corrected error message and logic
-            frappe.throw(f"Missing required field: {field} for FlyOut Inquiry ID {data.get('inquiry_id', 'N/A')}")
+    validate_inquiry_payload(data)
 
-    # Check if inquiry already exists
-    existing = frappe.db.get_value("Inquiry", {"flyout_inquiry_id": data["inquiry_id"]})
+    # Drop redeliveries before touching the database
+    idempotency_key = get_idempotency_key("Inquiry", data)
+    if not claim_event(idempotency_key):
+        return duplicate_response(data)
 
-    # Set the in_sync flag to prevent recursive sync
-    frappe.flags.in_sync = True
+    # Acknowledge now, apply later (see webhook_inbox)
+    if is_deferred_mode():
+        try:
+            return store_webhook_event("Inquiry", data)
+        except Exception:
+            release_event(idempotency_key)
+            raise
 
     try:
-        if existing:
-            # Update existing inquiry
-            doc = frappe.get_doc("Inquiry", existing)
-
-            # Update fields (only if provided)
-            if "applicant_name" in data:
-                doc.applicant_name = data["applicant_name"]
-            if "email" in data:
-                doc.contact_email = data["email"]
-            if "phone" in data:
-                doc.contact_phone = data["phone"]
-            if "service_type" in data:
-                doc.service_type = data["service_type"]
-            if "destination_country" in data:
-                doc.destination_country = data["destination_country"]
-            if "notes" in data and data["notes"]: # Added check for non-empty notes
-                # Append to existing notes
-                if doc.notes:
-                    doc.notes += f"\n\nUpdate from FlyOut ({now_datetime()}):\n{data.get('notes', '')}"
-                else:
-                    doc.notes = f"Update from FlyOut ({now_datetime()}):\n{data.get('notes', '')}"
-
-            # Save the document
-            doc.save(ignore_permissions=True) # Consider permissions? For now ignore.
+        # Drop events older than the applied state (locks the inquiry until commit)
+        event_ts = get_event_timestamp(data)
+        stale = is_stale_event(data["inquiry_id"], event_ts)
 
-            # Create sync log
-            create_sync_log("Inbound", "Success", "Inquiry", doc.name, data["inquiry_id"], data)
+        # Check if inquiry already exists
+        existing = frappe.db.get_value("Inquiry", {"flyout_inquiry_id": data["inquiry_id"]})
+    except Exception:
+        # e.g. a lock wait timeout: let FlyOut's redelivery through
+        release_event(idempotency_key)
+        raise
 
-            return {
-                "success": True,
-                "message": "Inquiry updated successfully",
-                "inquiry": doc.name
-            }
-        else:
-            # Create new inquiry
-            doc = frappe.new_doc("Inquiry")
-            doc.inquiry_source = "FlyOut"
-            doc.flyout_inquiry_id = data["inquiry_id"]
-            doc.applicant_name = data["applicant_name"]
-            doc.contact_email = data["email"]
-            doc.contact_phone = data["phone"]
-            doc.service_type = data["service_type"]
-            doc.status = "New" # Default status for new inquiries
-            doc.inquiry_date = get_datetime(data.get("created_at", now_datetime())).date()
+    if stale:
+        return stale_response(data)
 
-            # Optional fields
-            if "destination_country" in data:
-                doc.destination_country = data["destination_country"]
-            if "notes" in data and data["notes"]: # Added check for non-empty notes
-                doc.notes = f"From FlyOut:\n{data['notes']}"
+    # Set the in_sync flag to prevent recursive sync
+    frappe.flags.in_sync = True
 
-            # Insert the document
-            doc.insert(ignore_permissions=True) # Consider permissions? For now ignore.
+    try:
+        doc = apply_inquiry_payload(data, existing)
+        record_applied_version(doc.name, data["inquiry_id"], event_ts)
 
-            # Create sync log
-            create_sync_log("Inbound", "Success", "Inquiry", doc.name, data["inquiry_id"], data)
+        # Create sync log
+        create_sync_log("Inbound", "Success", "Inquiry", doc.name, data["inquiry_id"], data)
 
-            return {
-                "success": True,
-                "message": "Inquiry created successfully",
-                "inquiry": doc.name
-            }
+        return {
+            "success": True,
+            "message": "Inquiry updated successfully" if existing else "Inquiry created successfully",
+            "inquiry": doc.name
+        }
     except Exception as e:
+        # Let FlyOut's redelivery through
+        release_event(idempotency_key)
+
         # Log the error
         frappe.log_error(f"FlyOut Inquiry Sync Error: {str(e)}\nData: {data}", "FlyOut API Error")
 
@@ -120,6 +123,232 @@ def receive_inquiry(data=None, token=None):
 
 
 @frappe.whitelist(allow_guest=True)
+@timed("receive_inquiries_bulk")
+def receive_inquiries_bulk(data=None, token=None):
+    """
+    Endpoint to receive a batch of inquiries from FlyOut, e.g. when FlyOut
+    replays its backlog after an outage.
+
+    Expected JSON format (a bare list of inquiries is accepted as well):
+    {
+        "inquiries": [
+            {"inquiry_id": "FL-12345", "applicant_name": "John Doe", ...},
+            {"inquiry_id": "FL-12346", "applicant_name": "Jane Doe", ...}
+        ]
+    }
+
+    Each item uses the same format as `receive_inquiry`. The token is checked
+    once, existing inquiries are resolved with a single query and items are
+    applied in chunks of BULK_CHUNK_SIZE, one transaction per chunk.
+    A failing item does not affect the rest of its chunk.
+
+    Returns:
+        dict: Overall status plus one result per item, in request order.
+    """
+    # Validate token once for the whole batch
+    validate_flyout_token(token)
+
+    # Parse data if not already parsed
+    if isinstance(data, str):
+        data = json.loads(data)
+    if isinstance(data, dict):
+        data = data.get("inquiries")
+
+    if not isinstance(data, list):
+        frappe.throw(_("Expected a list of inquiries"))
+
+    results = process_inquiry_batch(data, deduplicate=True)
+
+    return {
+        "success": all(r["success"] for r in results),
+        "processed": len(results),
+        "failed": len([r for r in results if not r["success"]]),
+        "results": results
+    }
+
+
+def process_inquiry_batch(payloads, chunk_size=BULK_CHUNK_SIZE, endpoint=None, deduplicate=False, skip_applied=False):
+    """
+    Apply a list of FlyOut inquiry payloads, creating or updating Inquiries.
+
+    Args:
+        payloads (list): FlyOut inquiry payloads (see `receive_inquiry`).
+        chunk_size (int, optional): Number of items committed per transaction.
+        endpoint (str, optional): Endpoint recorded on the Sync Log rows.
+        deduplicate (bool, optional): Skip items already applied from an earlier delivery.
+        skip_applied (bool, optional): Also skip items exactly as old as the applied state
+            (a pull returns events webhooks have already delivered).
+
+    Returns:
+        list: One result dict per payload, in the same order.
+    """
+    if endpoint is None:
+        endpoint = get_inbound_endpoint("inquiries/bulk")
+
+    # Resolve all existing inquiries with a single query
+    inquiry_ids = list({d.get("inquiry_id") for d in payloads if isinstance(d, dict) and d.get("inquiry_id")})
+    existing_map = {}
+    if inquiry_ids:
+        existing_map = {
+            row.flyout_inquiry_id: row.name
+            for row in frappe.get_all(
+                "Inquiry",
+                filters={"flyout_inquiry_id": ["in", inquiry_ids]},
+                fields=["name", "flyout_inquiry_id"]
+            )
+        }
+
+    results = []
+
+    # Set the in_sync flag to prevent recursive sync
+    frappe.flags.in_sync = True
+
+    try:
+        for start in range(0, len(payloads), chunk_size):
+            sync_logs = []
+
+            for idx, data in enumerate(payloads[start:start + chunk_size], start=start):
+                inquiry_id = data.get("inquiry_id") if isinstance(data, dict) else None
+                idempotency_key = None
+                savepoint = f"flyout_bulk_{idx}"
+                frappe.db.savepoint(savepoint)
+
+                try:
+                    if not isinstance(data, dict):
+                        frappe.throw(_("Inquiry payload must be a JSON object"))
+                    validate_inquiry_payload(data)
+
+                    if deduplicate:
+                        # One request carries many events, so key each item by its content
+                        idempotency_key = get_idempotency_key("Inquiry", data, use_header=False)
+                        if not claim_event(idempotency_key):
+                            results.append({
+                                "inquiry_id": inquiry_id,
+                                "success": True,
+                                "action": "duplicate",
+                                "inquiry": existing_map.get(inquiry_id)
+                            })
+                            continue
+
+                    event_ts = get_event_timestamp(data)
+                    if is_stale_event(inquiry_id, event_ts, inclusive=skip_applied):
+                        results.append({
+                            "inquiry_id": inquiry_id,
+                            "success": True,
+                            "action": "stale",
+                            "inquiry": existing_map.get(inquiry_id)
+                        })
+                        continue
+
+                    existing = existing_map.get(inquiry_id)
+                    doc = apply_inquiry_payload(data, existing)
+                    record_applied_version(doc.name, inquiry_id, event_ts)
+
+                    # Later duplicates of the same ID in this batch update this doc
+                    existing_map[inquiry_id] = doc.name
+
+                    sync_logs.append(build_sync_log(
+                        "Inbound", "Success", "Inquiry", doc.name, inquiry_id, data,
+                        endpoint=endpoint, method="POST"
+                    ))
+                    results.append({
+                        "inquiry_id": inquiry_id,
+                        "success": True,
+                        "action": "updated" if existing else "created",
+                        "inquiry": doc.name
+                    })
+                except Exception as e:
+                    frappe.db.rollback(save_point=savepoint)
+                    release_event(idempotency_key)
+
+                    sync_logs.append(build_sync_log(
+                        "Inbound", "Error", "Inquiry", None, inquiry_id, data,
+                        error_message=str(e), endpoint=endpoint, method="POST"
+                    ))
+                    results.append({
+                        "inquiry_id": inquiry_id,
+                        "success": False,
+                        "message": str(e)
+                    })
+
+            # Write the chunk's Sync Log rows in one statement and close the transaction
+            bulk_insert_sync_logs(sync_logs)
+            frappe.db.commit()
+    finally:
+        # Reset the in_sync flag
+        frappe.flags.in_sync = False
+
+    return results
+
+
+def validate_inquiry_payload(data):
+    """Ensure a FlyOut inquiry payload carries all required fields"""
+    for field in INQUIRY_REQUIRED_FIELDS:
+        if field not in data:
+            frappe.throw(f"Missing required field: {field} for FlyOut Inquiry ID {data.get('inquiry_id', 'N/A')}")
+
+
+def apply_inquiry_payload(data, existing=None):
+    """
+    Create or update an Inquiry from a FlyOut inquiry payload.
+
+    Args:
+        data (dict): Validated FlyOut inquiry payload.
+        existing (str, optional): Name of the Inquiry to update; a new one is created if not given.
+
+    Returns:
+        Document: The saved Inquiry.
+    """
+    if existing:
+        # Update existing inquiry
+        doc = frappe.get_doc("Inquiry", existing)
+
+        # Update fields (only if provided)
+        if "applicant_name" in data:
+            doc.applicant_name = data["applicant_name"]
+        if "email" in data:
+            doc.contact_email = data["email"]
+        if "phone" in data:
+            doc.contact_phone = data["phone"]
+        if "service_type" in data:
+            doc.service_type = data["service_type"]
+        if "destination_country" in data:
+            doc.destination_country = data["destination_country"]
+        if "notes" in data and data["notes"]: # Added check for non-empty notes
+            # Append to existing notes
+            if doc.notes:
+                doc.notes += f"\n\nUpdate from FlyOut ({now_datetime()}):\n{data.get('notes', '')}"
+            else:
+                doc.notes = f"Update from FlyOut ({now_datetime()}):\n{data.get('notes', '')}"
+
+        # Save the document
+        doc.save(ignore_permissions=True) # Consider permissions? For now ignore.
+    else:
+        # Create new inquiry
+        doc = frappe.new_doc("Inquiry")
+        doc.inquiry_source = "FlyOut"
+        doc.flyout_inquiry_id = data["inquiry_id"]
+        doc.applicant_name = data["applicant_name"]
+        doc.contact_email = data["email"]
+        doc.contact_phone = data["phone"]
+        doc.service_type = data["service_type"]
+        doc.status = "New" # Default status for new inquiries
+        doc.inquiry_date = get_datetime(data.get("created_at", now_datetime())).date()
+
+        # Optional fields
+        if "destination_country" in data:
+            doc.destination_country = data["destination_country"]
+        if "notes" in data and data["notes"]: # Added check for non-empty notes
+            doc.notes = f"From FlyOut:\n{data['notes']}"
+
+        # Insert the document
+        doc.insert(ignore_permissions=True) # Consider permissions? For now ignore.
+
+    return doc
+
+
+@frappe.whitelist(allow_guest=True)
+@timed("update_inquiry_status")
 def update_inquiry_status(data=None, token=None):
     """
     Endpoint to receive inquiry status updates from FlyOut
@@ -140,66 +369,58 @@ def update_inquiry_status(data=None, token=None):
         data = json.loads(data)
 
     # Validate required fields
-    if "inquiry_id" not in data or "status" not in data:
-        frappe.throw(_("Missing required fields: inquiry_id, status"))
+    validate_status_payload(data)
 
-    # Find the inquiry
-    inquiry_name = frappe.db.get_value("Inquiry", {"flyout_inquiry_id": data["inquiry_id"]})
-    if not inquiry_name:
-         frappe.throw(_("Inquiry with FlyOut ID {0} not found").format(data['inquiry_id']))
+    # Drop redeliveries before touching the database
+    idempotency_key = get_idempotency_key("Status Update", data)
+    if not claim_event(idempotency_key):
+        return duplicate_response(data)
 
-    # Set the in_sync flag to prevent recursive sync
-    frappe.flags.in_sync = True
+    # Acknowledge now, apply later (see webhook_inbox)
+    if is_deferred_mode():
+        try:
+            return store_webhook_event("Status Update", data)
+        except Exception:
+            release_event(idempotency_key)
+            raise
 
     try:
-        # Get the inquiry document
-        doc = frappe.get_doc("Inquiry", inquiry_name)
-
-        # Map FlyOut status to our status (Adjust as per actual FlyOut statuses)
-        status_map = {
-            "Cancelled": "Rejected",
-            "Closed": "Rejected", # Assuming Closed means rejected from FlyOut perspective
-            "Active": "Under Review" # Assuming Active maps to Under Review
-            # Add more mappings as needed based on FlyOut's status lifecycle
-        }
+        # Drop events older than the applied state (locks the inquiry until commit)
+        event_ts = get_event_timestamp(data)
+        stale = is_stale_event(data["inquiry_id"], event_ts)
 
-        new_status = status_map.get(data["status"])
+        # Find the inquiry
+        inquiry_name = frappe.db.get_value("Inquiry", {"flyout_inquiry_id": data["inquiry_id"]})
+    except Exception:
+        # e.g. a lock wait timeout: let FlyOut's redelivery through
+        release_event(idempotency_key)
+        raise
 
-        if new_status and new_status != doc.status:
-            # Add a comment about the status change
-            reason = data.get("reason", "No reason provided")
-            doc.add_comment("Info", f"Status changed by FlyOut to {data['status']}. Reason: {reason}")
+    if stale:
+        return stale_response(data)
 
-            # Update the status
-            # Note: This might trigger workflows. Ensure workflows handle this external change.
-            doc.status = new_status
+    if not inquiry_name:
+         release_event(idempotency_key)
+         frappe.throw(_("Inquiry with FlyOut ID {0} not found").format(data['inquiry_id']))
 
-            # Add notes if provided (optional, could be part of the reason)
-            if "notes" in data and data["notes"]:
-                 if doc.notes:
-                     doc.notes += f"\n\nStatus Update Notes from FlyOut ({now_datetime()}):\n{data['notes']}"
-                 else:
-                     doc.notes = f"Status Update Notes from FlyOut ({now_datetime()}):\n{data['notes']}"
+    # Set the in_sync flag to prevent recursive sync
+    frappe.flags.in_sync = True
 
-            # Save the document
-            doc.save(ignore_permissions=True) # Consider permissions
+    try:
+        changed = apply_status_update(data, inquiry_name)
+        record_applied_version(inquiry_name, data["inquiry_id"], event_ts)
 
+        if changed:
             # Create sync log
-            create_sync_log("Inbound", "Success", "Inquiry", doc.name, data["inquiry_id"], data)
+            create_sync_log("Inbound", "Success", "Inquiry", inquiry_name, data["inquiry_id"], data)
 
             return {
                 "success": True,
                 "message": "Inquiry status updated successfully"
             }
         else:
-            # If status doesn't map or hasn't changed, log info and return success
-            if not new_status:
-                 frappe.logger().info(f"FlyOut status '{data['status']}' for Inquiry {doc.name} has no defined mapping.")
-            else: # Status hasn't changed
-                 frappe.logger().info(f"FlyOut status update for Inquiry {doc.name} matches current status '{doc.status}'. No change applied.")
-
             # Create sync log for information even if no change applied
-            create_sync_log("Inbound", "Success", "Inquiry", doc.name, data["inquiry_id"], data, response_data={"message": "No status change applied or mapping not found."})
+            create_sync_log("Inbound", "Success", "Inquiry", inquiry_name, data["inquiry_id"], data, response_data={"message": "No status change applied or mapping not found."})
 
             return {
                 "success": True,
@@ -207,6 +428,9 @@ def update_inquiry_status(data=None, token=None):
              }
 
     except Exception as e:
+        # Let FlyOut's redelivery through
+        release_event(idempotency_key)
+
         # Log the error
         frappe.log_error(f"FlyOut Status Update Error: {str(e)}\nData: {data}", "FlyOut API Error")
 
@@ -220,40 +444,108 @@ def update_inquiry_status(data=None, token=None):
         frappe.flags.in_sync = False
 
 
-def validate_flyout_token(token):
-    """Validate the API token from FlyOut"""
-    if not token:
-        frappe.throw(_("Authentication token is required"), frappe.AuthenticationError)
+def validate_status_payload(data):
+    """Ensure a FlyOut status update payload carries all required fields"""
+    if "inquiry_id" not in data or "status" not in data:
+        frappe.throw(_("Missing required fields: inquiry_id, status"))
+
+
+def apply_status_update(data, inquiry_name):
+    """
+    Apply a FlyOut status update to an Inquiry.
 
-    # Get settings
-    settings = frappe.get_cached_doc("FlyOut Account Settings")
+    Args:
+        data (dict): Validated FlyOut status payload.
+        inquiry_name (str): Inquiry to update.
 
-    # Check if sync is enabled first
-    if not settings.enable_sync:
-        frappe.throw(_("Synchronization is disabled in FlyOut Account Settings"), frappe.ValidationError)
+    Returns:
+        bool: True if the status changed, False if it was unmapped or unchanged.
+    """
+    # Get the inquiry document
+    doc = frappe.get_doc("Inquiry", inquiry_name)
+
+    new_status = FLYOUT_STATUS_MAP.get(data["status"])
+
+    if new_status and new_status != doc.status:
+        # Add a comment about the status change
+        reason = data.get("reason", "No reason provided")
+        doc.add_comment("Info", f"Status changed by FlyOut to {data['status']}. Reason: {reason}")
+
+        # Update the status
+        # Note: This might trigger workflows. Ensure workflows handle this external change.
+        doc.status = new_status
+
+        # Add notes if provided (optional, could be part of the reason)
+        if "notes" in data and data["notes"]:
+             if doc.notes:
+                 doc.notes += f"\n\nStatus Update Notes from FlyOut ({now_datetime()}):\n{data['notes']}"
+             else:
+                 doc.notes = f"Status Update Notes from FlyOut ({now_datetime()}):\n{data['notes']}"
 
-    # Check if token matches
-    # Use get_password for secure retrieval
-    api_key = settings.get_password('api_key')
-    if not api_key or api_key != token:
-        frappe.throw(_("Invalid authentication token"), frappe.AuthenticationError)
+        # Save the document
+        doc.save(ignore_permissions=True) # Consider permissions
+        return True
+
+    # If status doesn't map or hasn't changed, log info
+    if not new_status:
+         frappe.logger().info(f"FlyOut status '{data['status']}' for Inquiry {doc.name} has no defined mapping.")
+    else: # Status hasn't changed
+         frappe.logger().info(f"FlyOut status update for Inquiry {doc.name} matches current status '{doc.status}'. No change applied.")
+    return False
+
+
+def validate_flyout_token(token):
+    """Validate the API token (and webhook signature, if a secret is set) from FlyOut"""
+    # Uses a per-worker cached verifier, see webhook_auth
+    verify_token(token)
 
 
-def create_sync_log(direction, status, doctype=None, docname=None, flyout_id=None, request_data=None, response_data=None, error_message=None):
-    """Create a sync log entry"""
+def create_sync_log(direction, status, doctype=None, docname=None, flyout_id=None, request_data=None, response_data=None, error_message=None, endpoint=None, method=None):
+    """
+    Create a sync log entry.
+
+    Unless buffering is disabled in FlyOut Account Settings, non-error logs are
+    staged in Sync Log Buffer and written by a background flush (see
+    sync_log_buffer). Error logs are always inserted right away because the
+    retry scheduler updates them.
+    """
     try:
-        log = frappe.new_doc("Sync Log")
-        log.sync_datetime = now_datetime()
-        log.direction = direction
-        log.status = status
-
-        if doctype:
-            log.reference_doctype = doctype
-        if docname:
-            log.reference_name = docname
-        if flyout_id:
-            log.flyout_reference_id = flyout_id
+        log = build_sync_log(
+            direction, status, doctype, docname, flyout_id, request_data, response_data,
+            error_message=error_message, endpoint=endpoint, method=method
+        )
 
+        # Keep audit-only logs off the request path
+        if status != "Error" and get_buffer_config()[0]:
+            return buffer_sync_log(log)
+
+        # Insert the log
+        log.insert(ignore_permissions=True)
+
+        return log.name
+    except Exception as e:
+        # Log error in creating sync log itself
+        frappe.log_error(f"Failed to create Sync Log: {str(e)}", "Sync Log Creation Error")
+        return None # Indicate failure
+
+
+def build_sync_log(direction, status, doctype=None, docname=None, flyout_id=None, request_data=None, response_data=None, error_message=None, endpoint=None, method=None):
+    """Build an unsaved Sync Log document (see `create_sync_log` and `bulk_insert_sync_logs`)"""
+    log = frappe.new_doc("Sync Log")
+    log.sync_datetime = now_datetime()
+    log.direction = direction
+    log.status = status
+
+    if doctype:
+        log.reference_doctype = doctype
+    if docname:
+        log.reference_name = docname
+    if flyout_id:
+        log.flyout_reference_id = flyout_id
+
+    if endpoint:
+        log.endpoint = endpoint
+    else:
         # Get endpoint from settings if possible, otherwise use placeholder
         try:
             settings = frappe.get_cached_doc("FlyOut Account Settings")
@@ -270,35 +562,65 @@ def create_sync_log(direction, status, doctype=None, docname=None, flyout_id=Non
         except Exception:
             log.endpoint = "FlyOut Settings not found"
 
-
-        # Method based on direction or request
+    # Method based on direction or request
+    if method:
+        log.method = method
+    else:
         log.method = frappe.request.method if frappe.request else ("POST" if direction == "Outbound" else "Webhook")
 
-        # Store request and response data safely
-        try:
-            if request_data:
-                log.request_data = json.dumps(request_data, indent=2) if isinstance(request_data, (dict, list)) else str(request_data)
-        except Exception as e:
-            log.request_data = f"Error serializing request data: {e}"
+    # Store request and response data safely (compact, compressed if enabled, see payload_codec)
+    try:
+        if request_data:
+            log.request_data = encode_payload(request_data)
+    except Exception as e:
+        log.request_data = f"Error serializing request data: {e}"
 
-        try:
-            if response_data:
-                log.response_data = json.dumps(response_data, indent=2) if isinstance(response_data, (dict, list)) else str(response_data)
-        except Exception as e:
-            log.response_data = f"Error serializing response data: {e}"
+    try:
+        if response_data:
+            log.response_data = encode_payload(response_data)
+    except Exception as e:
+        log.response_data = f"Error serializing response data: {e}"
 
 
-        # Store error details if any
-        if status == "Error" and error_message:
-            log.error_type = "API Error" # Or determine more specific type if possible
-            log.error_message = str(error_message)
-            log.stack_trace = frappe.get_traceback()
+    # Store error details if any
+    if status == "Error" and error_message:
+        log.error_type = "API Error" # Or determine more specific type if possible
+        log.error_message = str(error_message)
+        log.stack_trace = encode_payload(frappe.get_traceback())
 
-        # Insert the log
-        log.insert(ignore_permissions=True)
+    return log
 
-        return log.name
+
+def bulk_insert_sync_logs(logs):
+    """
+    Insert several Sync Log documents with a single multi-row INSERT.
+
+    Sync Log has no controller hooks, so skipping `Document.insert` loses nothing
+    and saves one round trip per row.
+
+    Args:
+        logs (list): Unsaved Sync Log documents, e.g. from `build_sync_log`.
+
+    Returns:
+        list: Names of the inserted logs (empty on failure).
+    """
+    if not logs:
+        return []
+
+    try:
+        insert_sync_log_rows([prepare_sync_log_row(log) for log in logs])
+
+        return [log.name for log in logs]
     except Exception as e:
-        # Log error in creating sync log itself
-        frappe.log_error(f"Failed to create Sync Log: {str(e)}", "Sync Log Creation Error")
-        return None # Indicate failure 
\ No newline at end of file
+        # Log error in creating sync logs themselves
+        frappe.log_error(f"Failed to bulk insert {len(logs)} Sync Logs: {str(e)}", "Sync Log Creation Error")
+        return []
+
+
+def get_inbound_endpoint(path):
+    """Return the webhook endpoint label recorded on inbound Sync Logs"""
+    try:
+        settings = frappe.get_cached_doc("FlyOut Account Settings")
+        return f"{settings.flyout_base_url}/webhooks/{path}"
+    except Exception:
+        return "FlyOut Settings not found"
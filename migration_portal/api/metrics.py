@@ -0,0 +1,37 @@
+import frappe
+from werkzeug.wrappers import Response
+
+from migration_portal.migration_portal.utils import sync_metrics
+
+
+@frappe.whitelist(methods=["GET"])
+def prometheus():
+    """
+    FlyOut sync metrics in the Prometheus text format.
+
+    Scrape with a System Manager's API key, e.g.
+    `authorization: token <api_key>:<api_secret>` on
+    /api/method/migration_portal.migration_portal.api.metrics.prometheus
+    """
+    frappe.only_for("System Manager")
+
+    return Response(
+        sync_metrics.render_prometheus(),
+        mimetype="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@frappe.whitelist()
+def get_sync_metrics():
+    """Metrics summary for the FlyOut Sync Metrics desk page"""
+    frappe.only_for(["System Manager", "Migration Manager"])
+
+    return sync_metrics.get_summary()
+
+
+@frappe.whitelist(methods=["POST"])
+def reset_sync_metrics():
+    """Clear all counters and latency histograms"""
+    frappe.only_for("System Manager")
+
+    sync_metrics.reset_metrics()
@@ -2,12 +2,23 @@
 # For license information, please see license.txt
 
 import frappe
+from frappe import _
 from frappe.model.document import Document
 from frappe.utils import now_datetime
 
 # Import actual sync functions
-from migration_portal.migration_portal.api.flyout import log_sync_attempt
-from migration_portal.migration_portal.utils.sync_utils import schedule_sync, push_client_updates
+from migration_portal.migration_portal.utils.sync_utils import (
+	schedule_sync, push_client_updates, get_changed_sync_fields, build_sync_payload, CLIENT_FIELD_MAP
+)
+from migration_portal.migration_portal.utils.sync_queue import request_outbound_sync
+
+# Map Frappe status to FlyOut status (adjust mapping as needed)
+FLYOUT_STATUS_MAP = {
+	"Active": "ACTIVE",
+	"In Progress": "IN_PROGRESS", # Example mapping
+	"Completed": "COMPLETED",
+	"Cancelled": "CANCELLED"
+}
 
 # Function potentially called by the 'on_update' hook in hooks.py (if uncommented later)
 # def trigger_client_sync(doc, method):
@@ -42,52 +53,81 @@ class Client(Document):
 	def on_update(self):
 		# Sync updates to FlyOut if linked inquiry source was FlyOut
 		if not frappe.flags.get("in_sync"):
-			db_status = frappe.db.get_value(self.doctype, self.name, "status")
-			if db_status and self.status != db_status:
-				# Map Frappe status to FlyOut status (adjust mapping as needed)
-				flyout_status_map = {
-					"Active": "ACTIVE", 
-					"In Progress": "IN_PROGRESS", # Example mapping
-					"Completed": "COMPLETED",
-					"Cancelled": "CANCELLED"
-				}
-				flyout_status = flyout_status_map.get(self.status, self.status.upper().replace(" ", "_")) 
-				self.sync_client_to_flyout(flyout_status)
+			changed_fields = get_changed_sync_fields(self, CLIENT_FIELD_MAP)
+			if changed_fields:
+				self.trigger_flyout_sync(changed_fields)
 
 	def on_submit(self):
-		# Sync status update (workflow state might be more reliable)
-		self.sync_client_to_flyout("ACTIVE") # Assuming 'Submitted'/'Active' maps to 'ACTIVE' in FlyOut
+		# Nothing to push here: on_update runs first on submit and already reports
+		# "status" as changed (get_changed_sync_fields counts the docstatus change)
+		pass
 
 	def on_cancel(self):
 		# Sync status update
-		self.sync_client_to_flyout("CANCELLED")
+		self.trigger_flyout_sync(["status"])
 
-	def sync_client_to_flyout(self, flyout_status):
-		"""Sends client updates to FlyOut if the original inquiry source was FlyOut."""
+	def trigger_flyout_sync(self, changed_fields=None):
+		"""
+		Pushes this client to FlyOut now, or records a pending push for the sync queue worker.
+
+		Args:
+			changed_fields (list, optional): Fields changed by this save; everything mapped if None.
+		"""
+		if changed_fields is not None and not changed_fields:
+			return
+
+		if not self.get_flyout_inquiry_id():
+			return
+
+		request_outbound_sync(self.doctype, self.name, changed_fields, doc=self)
+
+	def get_flyout_inquiry_id(self):
+		"""Returns the FlyOut inquiry ID if the linked inquiry came from FlyOut."""
 		if self.linked_inquiry:
 			inquiry = frappe.get_cached_doc("Inquiry", self.linked_inquiry)
 			if inquiry.inquiry_source == "FlyOut" and inquiry.flyout_inquiry_id:
-				settings = frappe.get_cached_doc("FlyOut Account Settings")
-				if settings.enable_sync:
-					data = {
-						"inquiry_id": inquiry.flyout_inquiry_id, # Still identifying by original FlyOut ID
-						"status": flyout_status, 
-						# Add other relevant fields if FlyOut needs them (e.g., if FlyOut has client-specific fields)
-						"applicant_name": self.client_name,
-						"email": self.email,
-						"phone": self.phone,
-						"updated_at": str(now_datetime())
-					}
-					
-					# Use the specific function from sync_utils
-					result = push_client_updates(data, settings)
-					
-					# Logging is handled within push_client_updates
-					
-					if not result.get("success"):
-						frappe.msgprint(f"Failed to sync Client {self.name} update to FlyOut: {result.get('message')}", indicator='red', alert=True)
-						# Schedule retry
-						schedule_sync("Client", self.name)
+				return inquiry.flyout_inquiry_id
+
+	def get_flyout_status(self):
+		"""Maps the current client status to the FlyOut status."""
+		if self.docstatus == 2:
+			return "CANCELLED"
+		return FLYOUT_STATUS_MAP.get(self.status, (self.status or "").upper().replace(" ", "_"))
+
+	def sync_to_flyout(self, is_retry=False, originating_log=None, changed_fields=None):
+		"""
+		Sends the current client state to FlyOut.
+		Called by the sync queue worker and by sync_utils.retry_sync.
+		"""
+		return self.sync_client_to_flyout(self.get_flyout_status(), is_retry=is_retry, changed_fields=changed_fields)
+
+	def sync_client_to_flyout(self, flyout_status, is_retry=False, changed_fields=None):
+		"""Sends client updates to FlyOut if the original inquiry source was FlyOut."""
+		flyout_inquiry_id = self.get_flyout_inquiry_id()
+		if flyout_inquiry_id:
+			settings = frappe.get_cached_doc("FlyOut Account Settings")
+			if settings.enable_sync:
+				values = self.as_dict()
+				values["status"] = flyout_status
+
+				data = {"inquiry_id": flyout_inquiry_id} # Still identifying by original FlyOut ID
+				# Only the mapped fields that changed (all of them on retries)
+				data.update(build_sync_payload(values, CLIENT_FIELD_MAP, changed_fields))
+				if len(data) == 1:
+					return {"success": True, "skipped": True, "message": "No FlyOut fields changed, nothing to sync."}
+				data["updated_at"] = str(now_datetime())
+				
+				# Use the specific function from sync_utils
+				result = push_client_updates(data, settings, client_name=self.name)
+				
+				# Logging is handled within push_client_updates
+				
+				if not result.get("success") and not is_retry:
+					frappe.msgprint(f"Failed to sync Client {self.name} update to FlyOut: {result.get('message')}", indicator='red', alert=True)
+					# Schedule retry
+					schedule_sync("Client", self.name)
+
+				return result
 
 	def update_required_document_status(self):
 		"""Updates status in 'required_documents' table based on 'submitted_documents' table."""
@@ -107,4 +147,48 @@ class Client(Document):
 		
 		if updated:
 			frappe.msgprint(_("Required document statuses updated based on submissions."), indicator="blue")
-			# No need to explicitly save the child table row here, happens on main doc save 
\ No newline at end of file
+			# No need to explicitly save the child table row here, happens on main doc save 
+
+
+def mark_required_documents_received(client, document_names):
+	"""
+	Mark a Client's pending required documents as received, without saving the Client.
+
+	Only the matching `required_documents` rows are touched, with one locked
+	SELECT and one UPDATE, so the parent is not loaded, validated or pushed to
+	FlyOut. No parent-level field is derived from these rows, so the Client
+	itself is only touched to bump `modified` (open forms then reload instead
+	of overwriting the rows).
+
+	Args:
+		client (str): Client name.
+		document_names (list): Document names that were submitted.
+
+	Returns:
+		int: Number of rows marked as received.
+	"""
+	document_names = [d for d in document_names if d]
+	if not document_names:
+		return 0
+
+	rows = frappe.get_all(
+		"Client Document",
+		filters={
+			"parenttype": "Client",
+			"parentfield": "required_documents",
+			"parent": client,
+			"document_name": ["in", document_names],
+			"status": "Pending"
+		},
+		pluck="name",
+		for_update=True
+	)
+	if not rows:
+		return 0
+
+	now = now_datetime()
+	frappe.db.set_value("Client Document", {"name": ["in", rows]}, {"status": "Received", "modified": now}, update_modified=False)
+	frappe.db.set_value("Client", client, "modified", now, update_modified=False)
+
+	frappe.msgprint(_("Required document statuses updated based on submissions."), indicator="blue")
+	return len(rows)
@@ -1,9 +1,11 @@
 # Copyright (c) 2024, RavanOS and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
 
+from migration_portal.migration_portal.doctype.client.client import mark_required_documents_received
+
 
 class ClientSubmittedDocument(Document):
 	def validate(self):
@@ -12,12 +14,10 @@ class ClientSubmittedDocument(Document):
 			self.document_name = self.attachment.split('/')[-1]
 
 	def on_update(self):
-		# Trigger update on parent Client doc after save
-		if self.parenttype == "Client" and self.parent:
+		# Mark the matching required document rows as received, without loading or saving the Client
+		if self.parenttype == "Client" and self.parent and self.document_name:
 			try:
-				client_doc = frappe.get_doc(self.parenttype, self.parent)
-				client_doc.update_required_document_status() # Call the method we added earlier
-				client_doc.save(ignore_permissions=True) # Save the client doc to persist changes in required_documents
+				mark_required_documents_received(self.parent, [self.document_name])
 			except Exception as e:
 				frappe.log_error(f"Failed to update Client status on ClientSubmittedDocument update: {e}")
 
@@ -2,6 +2,7 @@
 # For license information, please see license.txt
 
 import frappe
+from frappe import _
 from frappe.model.document import Document
 
 class FlyOutAccountSettings(Document):
@@ -22,6 +23,10 @@ class FlyOutAccountSettings(Document):
 		"""Called automatically on save/update."""
 		self.update_sync_status_on_save()
 
+		# API key, webhook secret or enable_sync may have changed
+		from migration_portal.migration_portal.utils.webhook_auth import invalidate_verifier
+		invalidate_verifier()
+
 	def update_sync_status_on_save(self):
 		"""
 		Updates the read-only sync_status field based on other settings.
@@ -60,7 +65,8 @@ class FlyOutAccountSettings(Document):
 			
 			from migration_portal.migration_portal.utils.sync_utils import make_api_request
 			
-			response = make_api_request("GET", test_endpoint, headers, max_retries=1) # Only try once for test
+			# Single attempt, sent even if the circuit breaker is open so it can act as a probe
+			response = make_api_request("GET", test_endpoint, headers, bypass_circuit=True)
 			
 			frappe.msgprint("API Connection Successful!", title="Success", indicator="green")
 			# Optionally update status to Active if it was in Error
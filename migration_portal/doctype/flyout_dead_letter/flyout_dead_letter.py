@@ -0,0 +1,10 @@
+# Copyright (c) 2024, RavanOS and contributors
+# For license information, please see license.txt
+
+# import frappe
+from frappe.model.document import Document
+
+
+class FlyOutDeadLetter(Document):
+	# One entry per document whose sync exhausted its retries, see migration_portal.utils.dead_letter
+	pass
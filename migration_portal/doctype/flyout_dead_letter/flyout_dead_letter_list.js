@@ -0,0 +1,37 @@
+// Copyright (c) 2024, RavanOS and contributors
+// For license information, please see license.txt
+
+frappe.listview_settings["FlyOut Dead Letter"] = {
+	get_indicator: function(doc) {
+		const colors = {"Open": "red", "Replay Queued": "orange", "Resolved": "green"};
+		return [__(doc.status), colors[doc.status], "status,=," + doc.status];
+	},
+
+	onload: function(listview) {
+		const replay = function(args) {
+			frappe.call({
+				method: "migration_portal.migration_portal.utils.dead_letter.replay_dead_letters",
+				args: args,
+				callback: function(r) {
+					frappe.show_alert({message: r.message, indicator: "green"});
+					listview.refresh();
+				}
+			});
+		};
+
+		// Replay everything still open, optionally narrowed to the error type filtered on
+		listview.page.add_inner_button(__("Replay Open"), function() {
+			const filter = (listview.filter_area.get() || []).find(f => f[1] === "error_type" && f[2] === "=");
+			const error_type = filter ? filter[3] : null;
+			const label = error_type ? __("all open dead letters with error type {0}", [error_type]) : __("all open dead letters");
+
+			frappe.confirm(__("Push {0} to FlyOut again?", [label]), function() {
+				replay({error_type: error_type});
+			});
+		});
+
+		listview.page.add_actions_menu_item(__("Replay Selected"), function() {
+			replay({names: listview.get_checked_items(true)});
+		});
+	}
+};
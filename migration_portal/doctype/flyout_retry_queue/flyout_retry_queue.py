@@ -0,0 +1,10 @@
+# Copyright (c) 2024, RavanOS and contributors
+# For license information, please see license.txt
+
+# import frappe
+from frappe.model.document import Document
+
+
+class FlyOutRetryQueue(Document):
+	# One row per pending retry, written by sync_utils.schedule_sync and removed when the dispatcher claims it
+	pass
@@ -0,0 +1,26 @@
+# Copyright (c) 2024, RavanOS and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder import Interval
+from frappe.query_builder.functions import Now
+
+# Failed entries are kept at least this many days for investigation (the failure itself is kept on its Sync Log and dead letter)
+FAILED_RETENTION_DAYS = 30
+
+
+class FlyOutSyncQueue(Document):
+	# Entries are written by migration_portal.utils.sync_queue and drained by a background worker
+
+	@staticmethod
+	def clear_old_logs(days=7):
+		"""Called by Log Settings (see default_log_clearing_doctypes in hooks.py)"""
+		table = frappe.qb.DocType("FlyOut Sync Queue")
+		frappe.db.delete(
+			table,
+			filters=(
+				((table.status == "Completed") & (table.modified < (Now() - Interval(days=days))))
+				| ((table.status == "Failed") & (table.modified < (Now() - Interval(days=max(days, FAILED_RETENTION_DAYS)))))
+			)
+		)
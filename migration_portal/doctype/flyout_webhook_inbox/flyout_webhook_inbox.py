@@ -0,0 +1,26 @@
+# Copyright (c) 2024, RavanOS and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder import Interval
+from frappe.query_builder.functions import Now
+
+# Failed entries are kept at least this many days for investigation (they hold the only copy of an event that was never applied)
+FAILED_RETENTION_DAYS = 30
+
+
+class FlyOutWebhookInbox(Document):
+	# Entries are written by the FlyOut webhook endpoints in Deferred mode and applied by migration_portal.utils.webhook_inbox
+
+	@staticmethod
+	def clear_old_logs(days=7):
+		"""Called by Log Settings (see default_log_clearing_doctypes in hooks.py)"""
+		table = frappe.qb.DocType("FlyOut Webhook Inbox")
+		frappe.db.delete(
+			table,
+			filters=(
+				((table.status == "Processed") & (table.modified < (Now() - Interval(days=days))))
+				| ((table.status == "Failed") & (table.modified < (Now() - Interval(days=max(days, FAILED_RETENTION_DAYS)))))
+			)
+		)
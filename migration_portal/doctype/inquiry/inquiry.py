@@ -7,7 +7,11 @@ from frappe.utils import now_datetime
 
 # Import sync utility
 # Make sure the path is correct based on your app structure
-from migration_portal.migration_portal.utils.sync_utils import push_inquiry_updates, schedule_sync
+from migration_portal.migration_portal.utils.sync_utils import (
+	push_inquiry_updates, schedule_sync, get_changed_sync_fields, INQUIRY_FIELD_MAP
+)
+from migration_portal.migration_portal.utils.sync_queue import request_outbound_sync
+from migration_portal.migration_portal.utils.client_conversion import get_client_values
 
 # Function called by the 'on_update' hook in hooks.py
 def trigger_flyout_sync(doc, method):
@@ -20,7 +24,12 @@ def trigger_flyout_sync(doc, method):
 	if doc.inquiry_source == "FlyOut" and doc.flyout_inquiry_id:
 		# Check if it's not already being synced (to prevent loops)
 		if not frappe.flags.get("in_sync"):
-			doc.sync_to_flyout()
+			# Skip the push entirely if no FlyOut-mapped field changed
+			changed_fields = get_changed_sync_fields(doc, INQUIRY_FIELD_MAP)
+			if not changed_fields:
+				return
+
+			request_outbound_sync(doc.doctype, doc.name, changed_fields, doc=doc)
 
 
 class Inquiry(Document):
@@ -46,7 +55,7 @@ class Inquiry(Document):
 		pass
 
 	# ----- Custom Methods -----
-	def sync_to_flyout(self, is_retry=False, originating_log=None):
+	def sync_to_flyout(self, is_retry=False, originating_log=None, changed_fields=None):
 		"""
 		Sends inquiry data (or specific updates) to FlyOut if the source is FlyOut.
 		Handles calling the push_inquiry_updates utility.
@@ -54,6 +63,10 @@ class Inquiry(Document):
 		Args:
 			is_retry (bool): Indicates if this call is a retry attempt.
 			originating_log (str): The name of the Sync Log that initiated the retry, if applicable.
+			changed_fields (list): Fields changed since the last push; everything mapped if None.
+
+		Returns:
+			dict: Result of push_inquiry_updates, or None if nothing was pushed.
 		"""
 		if self.inquiry_source != "FlyOut" or not self.flyout_inquiry_id:
 			return # Don't sync if not a FlyOut inquiry or no ID
@@ -70,7 +83,7 @@ class Inquiry(Document):
 
 		# Call the push utility function
 		# It handles the API call, logging, and retry scheduling
-		result = push_inquiry_updates(self, settings) # Pass the document itself
+		result = push_inquiry_updates(self, settings, changed_fields=changed_fields, schedule_retry=not is_retry) # Pass the document itself
 
 		# Optionally, add UI feedback based on the result
 		if is_retry:
@@ -87,7 +100,9 @@ class Inquiry(Document):
 				indicator='red',
 				alert=True
 			)
-			# Note: Retry scheduling is handled within push_inquiry_updates -> make_api_request -> schedule_sync
+			# Note: Retry scheduling is handled within push_inquiry_updates -> schedule_sync
+
+		return result
 
 
 	# ----- Client Conversion (Called via Workflow Action) -----
@@ -107,26 +122,8 @@ class Inquiry(Document):
 			return self.linked_client # Return existing client link
 
 		try:
-			# Create new Client document
-			client = frappe.new_doc("Client")
-			client.linked_inquiry = self.name
-			client.client_name = self.applicant_name
-			client.email = self.contact_email
-			client.phone = self.contact_phone
-			client.service_type = self.service_type
-			client.destination_country = self.destination_country
-			client.primary_consultant = self.assigned_to or frappe.session.user # Assign or default
-
-			# Map address (simple example)
-			if self.address:
-				address_parts = self.address.split('\n')
-				client.address_line1 = address_parts[0]
-				if len(address_parts) > 1:
-					client.address_line2 = address_parts[1]
-				# TODO: Add more robust address parsing if needed (city, state, country, postal code)
-
-			# Set initial Client status (assuming Workflow handles Inquiry status change)
-			client.status = "Active"
+			# Same field mapping as the bulk conversion job
+			client = frappe.get_doc(get_client_values(self))
 			client.insert(ignore_permissions=True) # Ignore perms for automated creation
 
 			# Update Inquiry link (status is handled by workflow)
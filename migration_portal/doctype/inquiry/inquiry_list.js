@@ -0,0 +1,42 @@
+// Copyright (c) 2024, RavanOS and contributors
+// For license information, please see license.txt
+
+frappe.listview_settings["Inquiry"] = {
+	onload: function(listview) {
+		listview.page.add_actions_menu_item(__("Convert to Client"), function() {
+			const names = listview.get_checked_items(true);
+
+			frappe.confirm(__("Convert {0} Inquiries to Clients?", [names.length]), function() {
+				frappe.call({
+					method: "migration_portal.migration_portal.utils.client_conversion.convert_inquiries",
+					args: {names: names},
+					freeze: true,
+					callback: function(r) {
+						if (r.message && r.message.queued) {
+							frappe.show_alert({message: __("Converting {0} Inquiries in the background", [r.message.total]), indicator: "blue"});
+						} else if (r.message) {
+							show_conversion_summary(r.message);
+						}
+						listview.refresh();
+					}
+				});
+			});
+		});
+
+		// Outcome of a background conversion started by this user (once, however often the list is loaded)
+		frappe.realtime.off("inquiry_conversion_complete");
+		frappe.realtime.on("inquiry_conversion_complete", function(summary) {
+			show_conversion_summary(summary);
+			listview.refresh();
+		});
+	}
+};
+
+function show_conversion_summary(summary) {
+	const failed = summary.results.filter(r => r.status === "Failed");
+	let message = __("{0} converted, {1} skipped, {2} failed", [summary.converted, summary.skipped, summary.failed]);
+	if (failed.length) {
+		message += "<br><br>" + failed.map(r => `${frappe.utils.escape_html(r.inquiry)}: ${frappe.utils.escape_html(r.message || "")}`).join("<br>");
+	}
+	frappe.msgprint({title: __("Inquiry Conversion"), message: message, indicator: failed.length ? "orange" : "green"});
+}
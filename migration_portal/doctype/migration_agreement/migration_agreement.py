@@ -4,6 +4,8 @@
 import frappe
 from frappe.model.document import Document
 
+from migration_portal.migration_portal.utils.link_table import add_link, remove_link
+
 class MigrationAgreement(Document):
 	def validate(self):
 		# Fetch signatory designation if user is selected
@@ -31,30 +33,17 @@ class MigrationAgreement(Document):
 			party_doctype = self.party_type
 			party_name = self.client if self.party_type == "Client" else self.inquiry
 			child_table_field = "agreements" # Fieldname in Client/Inquiry
-			child_doctype = "Client Agreement" if self.party_type == "Client" else "Inquiry Agreement" # Child DocType name
 			link_field = "agreement" # Fieldname in the child table linking to this agreement
 
 			try:
-				party_doc = frappe.get_doc(party_doctype, party_name)
-				
+				# Row-level insert/delete, the party document is not loaded or saved
 				if action == "add":
-					# Check if already linked
-					already_linked = any(d.get(link_field) == self.name for d in party_doc.get(child_table_field))
-					if not already_linked:
-						party_doc.append(child_table_field, {
-							link_field: self.name,
-							# status field in child table is fetched automatically based on Client Agreement doctype definition
-						})
-						party_doc.save(ignore_permissions=True)
+					if add_link(party_doctype, party_name, child_table_field, link_field, self.name):
 						frappe.msgprint(f"Agreement linked to {party_doctype} {party_name}")
-						
+
 				elif action == "remove":
-					# Find and remove the link
-					updated_links = [d for d in party_doc.get(child_table_field) if d.get(link_field) != self.name]
-					if len(updated_links) < len(party_doc.get(child_table_field)):
-						party_doc.set(child_table_field, updated_links)
-						party_doc.save(ignore_permissions=True)
+					if remove_link(party_doctype, party_name, child_table_field, link_field, self.name):
 						frappe.msgprint(f"Agreement link removed from {party_doctype} {party_name}")
 
 			except Exception as e:
-				frappe.log_error(f"Failed to update {party_doctype} {party_name} for agreement {self.name}. Error: {e}") 
\ No newline at end of file
+				frappe.log_error(f"Failed to update {party_doctype} {party_name} for agreement {self.name}. Error: {e}")
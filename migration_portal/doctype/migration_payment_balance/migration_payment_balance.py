@@ -0,0 +1,15 @@
+# Copyright (c) 2024, RavanOS and contributors
+# For license information, please see license.txt
+
+# import frappe
+from frappe.model.document import Document
+
+from migration_portal.migration_portal.utils.payment_ledger import get_balance_name
+
+
+class MigrationPaymentBalance(Document):
+	# Running totals per party and currency, maintained by utils.payment_ledger on Migration Payment submit/cancel
+
+	def autoname(self):
+		# One row per party and currency, addressable without a query
+		self.name = get_balance_name(self.reference_type, self.reference_name, self.currency)
@@ -0,0 +1,23 @@
+# Copyright (c) 2024, RavanOS and contributors
+# For license information, please see license.txt
+
+# import frappe
+from frappe.model.document import Document
+
+from migration_portal.migration_portal.utils.naming import make_time_ordered_name
+from migration_portal.migration_portal.utils.payload_codec import decode_row
+
+# Prefix of Sync Log names
+SYNC_LOG_PREFIX = "SYNC"
+
+
+class SyncLog(Document):
+	# Rows are mostly written without this controller (bulk and buffered inserts), keep it free of insert hooks
+
+	def autoname(self):
+		# Time-ordered ULID instead of a naming series: no shared counter row to lock
+		self.name = make_time_ordered_name(SYNC_LOG_PREFIX)
+
+	def onload(self):
+		"""Show compressed request/response bodies and stack traces as readable text"""
+		decode_row(self)
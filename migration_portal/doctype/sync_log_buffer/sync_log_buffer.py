@@ -0,0 +1,10 @@
+# Copyright (c) 2024, RavanOS and contributors
+# For license information, please see license.txt
+
+# import frappe
+from frappe.model.document import Document
+
+
+class SyncLogBuffer(Document):
+	# Staging rows written by utils.sync_log_buffer in the request and moved to Sync Log by the flush job
+	pass
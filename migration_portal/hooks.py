@@ -180,6 +180,35 @@ doc_events = {
 # 	],
 # }
 
+scheduler_events = {
+	# Batch sync for Sync Frequency = Hourly / Daily / Weekly (each checks the setting)
+	"hourly": [
+		"migration_portal.migration_portal.utils.batch_sync.run_hourly",
+		# Reconcile inquiries changed on FlyOut (missed webhooks)
+		"migration_portal.migration_portal.utils.pull_sync.run_pull_sync"
+	],
+	"daily": [
+		"migration_portal.migration_portal.utils.batch_sync.run_daily",
+		# Archive and delete Sync Logs past their retention period
+		"migration_portal.migration_portal.utils.sync_log_retention.run_sync_log_retention"
+	],
+	"weekly": [
+		"migration_portal.migration_portal.utils.batch_sync.run_weekly"
+	],
+	"cron": {
+		# Drain pending outbound FlyOut pushes left behind by the on-save enqueue
+		"* * * * *": [
+			"migration_portal.migration_portal.utils.sync_queue.run_outbound_queue",
+			# Run failed syncs whose backoff has elapsed
+			"migration_portal.migration_portal.utils.sync_utils.dispatch_due_retries",
+			# Apply deferred FlyOut webhooks the on-receive enqueue did not pick up
+			"migration_portal.migration_portal.utils.webhook_inbox.run_webhook_inbox",
+			# Write buffered Sync Logs once the flush interval has passed
+			"migration_portal.migration_portal.utils.sync_log_buffer.run_sync_log_flush"
+		]
+	}
+}
+
 # Testing
 # -------
 
@@ -252,9 +281,10 @@ doc_events = {
 # Automatically update python controller files with type annotations for this app.
 # export_python_type_annotations = True
 
-# default_log_clearing_doctypes = {
-# 	"Logging DocType Name": 30  # days to retain logs
-# }
+default_log_clearing_doctypes = {
+	"FlyOut Sync Queue": 7,  # days to retain processed outbound sync entries
+	"FlyOut Webhook Inbox": 7  # days to retain applied inbound webhooks
+}
 
 # Fixtures
 # --------
@@ -0,0 +1,83 @@
+// Copyright (c) 2024, RavanOS and contributors
+// For license information, please see license.txt
+
+frappe.pages["flyout-sync-metrics"].on_page_load = function(wrapper) {
+	const page = frappe.ui.make_app_page({
+		parent: wrapper,
+		title: __("FlyOut Sync Metrics"),
+		single_column: true
+	});
+
+	const $body = $(`<div class="flyout-sync-metrics"></div>`).appendTo(page.main);
+
+	const format_seconds = (value) => {
+		if (value === null || value === undefined) return "> 10 s";
+		return value < 1 ? `${Math.round(value * 1000)} ms` : `${value.toFixed(2)} s`;
+	};
+
+	const render = (data) => {
+		const circuit = ["Closed", "Half-open", "Open"][data.gauges.circuit_state];
+		const cards = [
+			[__("Circuit Breaker"), circuit],
+			[__("Outbound Queue (Pending)"), data.gauges.outbound_queue_pending],
+			[__("Retry Queue"), data.gauges.retry_queue_depth],
+			[__("Webhook Inbox (Pending)"), data.gauges.webhook_inbox_pending],
+			[__("Buffered Sync Logs"), data.gauges.sync_log_buffer_depth],
+			[__("Rate Limit Block"), format_seconds(data.gauges.rate_limit_blocked_seconds)],
+			[__("Retries Scheduled"), data.totals.retries_scheduled_total],
+			[__("Dead-lettered"), data.totals.dead_lettered_total]
+		];
+
+		let html = `<div class="row">` + cards.map(([label, value]) => `
+			<div class="col-sm-4" style="margin-bottom: 15px;">
+				<div class="frappe-card" style="padding: 15px;">
+					<div class="text-muted small">${label}</div>
+					<div class="h4">${frappe.utils.escape_html(String(value))}</div>
+				</div>
+			</div>`).join("") + `</div>`;
+
+		html += `<table class="table table-bordered">
+			<thead><tr>
+				<th>${__("Operation")}</th><th>${__("Calls")}</th><th>${__("Outcomes")}</th>
+				<th>${__("Avg")}</th><th>${__("p50")}</th><th>${__("p95")}</th><th>${__("p99")}</th>
+			</tr></thead><tbody>`;
+
+		(data.operations || []).forEach((row) => {
+			const outcomes = Object.entries(row.outcomes).map(([k, v]) => `${k}: ${v}`).join(", ");
+			html += `<tr>
+				<td>${frappe.utils.escape_html(row.operation)}</td>
+				<td>${row.count}</td>
+				<td>${frappe.utils.escape_html(outcomes)}</td>
+				<td>${format_seconds(row.avg)}</td>
+				<td>${format_seconds(row.p50)}</td>
+				<td>${format_seconds(row.p95)}</td>
+				<td>${format_seconds(row.p99)}</td>
+			</tr>`;
+		});
+
+		if (!(data.operations || []).length) {
+			html += `<tr><td colspan="7" class="text-muted">${__("No sync activity recorded yet.")}</td></tr>`;
+		}
+		html += `</tbody></table>`;
+
+		$body.html(html);
+	};
+
+	const refresh = () => {
+		frappe.call("migration_portal.migration_portal.api.metrics.get_sync_metrics").then((r) => render(r.message));
+	};
+
+	page.set_primary_action(__("Refresh"), refresh);
+	page.add_menu_item(__("Reset Counters"), () => {
+		frappe.confirm(__("Clear all FlyOut sync counters and latency histograms?"), () => {
+			frappe.call("migration_portal.migration_portal.api.metrics.reset_sync_metrics").then(refresh);
+		});
+	});
+
+	refresh();
+
+	// Keep the numbers live while the page is open
+	setInterval(() => {
+		if (frappe.get_route_str() === "flyout-sync-metrics") refresh();
+	}, 15000);
+};
@@ -0,0 +1,33 @@
+import frappe
+
+
+def execute():
+	"""Index Sync Log for the sync subsystem's lookups and move pending retries to FlyOut Retry Queue"""
+	# schedule_sync: latest failed log of a document
+	frappe.db.add_index(
+		"Sync Log",
+		["reference_doctype", "reference_name", "status", "direction", "sync_datetime"],
+		index_name="reference_status_index"
+	)
+
+	# Retention: expired logs per status, oldest first
+	frappe.db.add_index("Sync Log", ["status", "sync_datetime"], index_name="status_sync_datetime_index")
+
+	# Retries scheduled before the retry queue existed
+	pending = frappe.get_all(
+		"Sync Log",
+		filters={"retry_scheduled": 1},
+		fields=["name", "reference_doctype", "reference_name", "next_retry_at", "retry_count", "sync_datetime"]
+	)
+	for log in pending:
+		if not log.reference_doctype or not log.reference_name or frappe.db.exists("FlyOut Retry Queue", log.name):
+			continue
+
+		frappe.get_doc({
+			"doctype": "FlyOut Retry Queue",
+			"sync_log": log.name,
+			"reference_doctype": log.reference_doctype,
+			"reference_name": log.reference_name,
+			"next_retry_at": log.next_retry_at or log.sync_datetime,
+			"retry_count": log.retry_count
+		}).insert(ignore_permissions=True)
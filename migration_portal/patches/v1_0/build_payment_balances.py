@@ -0,0 +1,9 @@
+import frappe
+
+from migration_portal.migration_portal.utils.payment_ledger import rebuild_balances
+
+
+def execute():
+	"""Build Migration Payment Balance from the payments submitted before it existed"""
+	frappe.reload_doc("migration_portal", "doctype", "migration_payment_balance")
+	rebuild_balances()
@@ -0,0 +1,213 @@
+import frappe
+from frappe.utils import now_datetime, get_datetime
+
+from migration_portal.migration_portal.api.flyout import create_sync_log
+from migration_portal.migration_portal.doctype.client.client import FLYOUT_STATUS_MAP
+from migration_portal.migration_portal.utils.sync_utils import (
+    make_api_request, build_sync_payload, update_sync_status, INQUIRY_FIELD_MAP, CLIENT_FIELD_MAP
+)
+
+# Number of documents sent to FlyOut per batch request
+PAGE_SIZE = 100
+
+
+def run_hourly():
+    """Scheduler entry point (hourly)"""
+    run_batch_sync("Hourly")
+
+
+def run_daily():
+    """Scheduler entry point (daily)"""
+    run_batch_sync("Daily")
+
+
+def run_weekly():
+    """Scheduler entry point (weekly)"""
+    run_batch_sync("Weekly")
+
+
+def run_batch_sync(frequency, page_size=PAGE_SIZE):
+    """
+    Push every FlyOut Inquiry and Client modified since the last batch to FlyOut.
+
+    Only runs if `frequency` matches FlyOut Account Settings.sync_frequency.
+    Documents modified in (last_sync_datetime, start of this run] are sent in
+    pages of `page_size`. The high-watermark (last_sync_datetime) is only
+    advanced once every page was accepted, with a compare-and-set so an
+    overlapping run cannot move it backwards or skip changes. A failed run is
+    simply repeated next period (pushes are idempotent).
+
+    Args:
+        frequency (str): "Hourly", "Daily" or "Weekly".
+        page_size (int, optional): Documents per batch request.
+
+    Returns:
+        dict: Number of inquiries and clients sent, or None if the run was skipped.
+    """
+    settings = frappe.get_cached_doc("FlyOut Account Settings")
+    if not settings.enable_sync or settings.sync_frequency != frequency:
+        return
+
+    cursor = settings.last_sync_datetime
+    until = now_datetime()
+
+    try:
+        sent_inquiries = 0
+        for page in iter_modified_inquiries(cursor, until, page_size):
+            push_batch(settings, page)
+            sent_inquiries += len(page)
+
+        sent_clients = 0
+        for page in iter_modified_clients(cursor, until, page_size):
+            push_batch(settings, page)
+            sent_clients += len(page)
+    except Exception as e:
+        frappe.log_error(f"FlyOut {frequency} batch sync failed: {e}\n{frappe.get_traceback()}", "FlyOut Batch Sync Error")
+        update_sync_status(settings, "Error")
+        return
+
+    advance_watermark(cursor, until)
+    update_sync_status(settings, "Active")
+    frappe.db.commit()
+
+    return {"inquiries": sent_inquiries, "clients": sent_clients}
+
+
+def iter_modified_inquiries(cursor, until, page_size):
+    """Yield pages of FlyOut payloads for FlyOut Inquiries modified in (cursor, until]"""
+    fields = ["name", "modified", "flyout_inquiry_id"] + list(INQUIRY_FIELD_MAP)
+    last = None
+
+    while True:
+        rows = frappe.db.sql(
+            f"""
+            select {", ".join(f"`{f}`" for f in fields)}
+            from `tabInquiry`
+            where inquiry_source = 'FlyOut'
+                and ifnull(flyout_inquiry_id, '') != ''
+                and modified <= %(until)s
+                {"and modified > %(cursor)s" if cursor else ""}
+                {"and (modified > %(last_modified)s or (modified = %(last_modified)s and name > %(last_name)s))" if last else ""}
+            order by modified asc, name asc
+            limit %(limit)s
+            """,
+            {
+                "cursor": cursor,
+                "until": until,
+                "last_modified": last and last.modified,
+                "last_name": last and last.name,
+                "limit": page_size
+            },
+            as_dict=True
+        )
+        if not rows:
+            return
+
+        yield [
+            dict(inquiry_id=row.flyout_inquiry_id, **build_sync_payload(row, INQUIRY_FIELD_MAP))
+            for row in rows
+        ]
+
+        if len(rows) < page_size:
+            return
+        last = rows[-1]
+
+
+def iter_modified_clients(cursor, until, page_size):
+    """Yield pages of FlyOut payloads for Clients (of FlyOut inquiries) modified in (cursor, until]"""
+    last = None
+
+    while True:
+        rows = frappe.db.sql(
+            f"""
+            select c.name, c.modified, c.docstatus, c.client_name, c.email, c.phone, c.status,
+                i.flyout_inquiry_id
+            from `tabClient` c
+            inner join `tabInquiry` i on i.name = c.linked_inquiry
+            where i.inquiry_source = 'FlyOut'
+                and ifnull(i.flyout_inquiry_id, '') != ''
+                and c.modified <= %(until)s
+                {"and c.modified > %(cursor)s" if cursor else ""}
+                {"and (c.modified > %(last_modified)s or (c.modified = %(last_modified)s and c.name > %(last_name)s))" if last else ""}
+            order by c.modified asc, c.name asc
+            limit %(limit)s
+            """,
+            {
+                "cursor": cursor,
+                "until": until,
+                "last_modified": last and last.modified,
+                "last_name": last and last.name,
+                "limit": page_size
+            },
+            as_dict=True
+        )
+        if not rows:
+            return
+
+        page = []
+        for row in rows:
+            # Same status mapping as Client.get_flyout_status
+            row.status = "CANCELLED" if row.docstatus == 2 else FLYOUT_STATUS_MAP.get(
+                row.status, (row.status or "").upper().replace(" ", "_")
+            )
+            page.append(dict(inquiry_id=row.flyout_inquiry_id, **build_sync_payload(row, CLIENT_FIELD_MAP)))
+        yield page
+
+        if len(rows) < page_size:
+            return
+        last = rows[-1]
+
+
+def push_batch(settings, items):
+    """
+    Send one page of inquiry updates to FlyOut's batch endpoint and log it.
+
+    Raises:
+        requests.exceptions.RequestException: If FlyOut rejects the batch.
+    """
+    endpoint = f"{settings.flyout_base_url}/providers/inquiries/batch" # Batch counterpart of the per-inquiry PUT
+    headers = {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {settings.get_password('api_key')}"
+    }
+    updated_at = now_datetime().isoformat()
+    payload = {"inquiries": [dict(item, updated_at=updated_at) for item in items]}
+
+    # Keep the Sync Log small: the documents themselves are in the database
+    summary = {"count": len(items), "inquiry_ids": [item["inquiry_id"] for item in items]}
+
+    try:
+        response = make_api_request("POST", endpoint, headers, payload)
+    except Exception as e:
+        create_sync_log("Outbound", "Error", request_data=summary, error_message=str(e), endpoint=endpoint, method="POST")
+        raise
+
+    response_data = response.json() if response.text else {}
+    create_sync_log("Outbound", "Success", request_data=summary, response_data=response_data, endpoint=endpoint, method="POST")
+
+
+def advance_watermark(expected, new_value):
+    """
+    Move FlyOut Account Settings.last_sync_datetime from `expected` to `new_value`.
+
+    The stored value is locked and compared first, so the move is atomic and
+    does nothing if another run already advanced the watermark.
+
+    Returns:
+        bool: True if the watermark was moved.
+    """
+    current = frappe.db.sql(
+        """
+        select value from `tabSingles`
+        where doctype = 'FlyOut Account Settings' and field = 'last_sync_datetime'
+        for update
+        """
+    )
+    current = get_datetime(current[0][0]) if current and current[0][0] else None
+
+    if current != (get_datetime(expected) if expected else None):
+        frappe.logger().info(f"FlyOut batch sync watermark moved by another run ({current}), not advancing.")
+        return False
+
+    frappe.db.set_single_value("FlyOut Account Settings", "last_sync_datetime", new_value)
+    return True
@@ -0,0 +1,147 @@
+import time
+
+import frappe
+import requests
+from frappe.utils import cint
+
+# Redis keys (site-prefixed through frappe.cache().make_key)
+FAILURES_KEY = "flyout_circuit_failures"
+OPENED_AT_KEY = "flyout_circuit_opened_at"
+PROBE_KEY = "flyout_circuit_probe"
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of calling FlyOut while the circuit is open"""
+
+
+def get_breaker_config(settings=None):
+    """
+    Read the circuit breaker settings.
+
+    Returns:
+        tuple: (failure_threshold, reset_timeout_seconds)
+    """
+    if not settings:
+        settings = frappe.get_cached_doc("FlyOut Account Settings")
+
+    return (
+        cint(settings.get("circuit_failure_threshold")) or 5,
+        cint(settings.get("circuit_reset_timeout")) or 60
+    )
+
+
+def _key(key):
+    return frappe.cache().make_key(key)
+
+
+def _opened_at():
+    value = frappe.cache().get(_key(OPENED_AT_KEY))
+    return float(value) if value else None
+
+
+def get_state():
+    """
+    Return the shared circuit state: "closed", "open" or "half-open".
+
+    Half-open means the reset timeout has elapsed and the next request may
+    probe FlyOut.
+    """
+    opened_at = _opened_at()
+    if opened_at is None:
+        return "closed"
+
+    reset_timeout = get_breaker_config()[1]
+    if time.time() - opened_at >= reset_timeout:
+        return "half-open"
+    return "open"
+
+
+def is_open():
+    """Return True while calls to FlyOut should fail fast (no probe due yet)"""
+    return get_state() == "open"
+
+
+def get_retry_after():
+    """Seconds until the circuit allows a probe request (0 if it is not open)"""
+    opened_at = _opened_at()
+    if opened_at is None:
+        return 0
+    return max(int(opened_at + get_breaker_config()[1] - time.time()), 0)
+
+
+def before_request():
+    """
+    Gate a request to FlyOut.
+
+    In the half-open state exactly one worker wins the probe slot; everyone
+    else keeps failing fast until the probe has closed or reopened the circuit.
+
+    Returns:
+        bool: True if this request holds the probe slot (see `release_probe`).
+
+    Raises:
+        CircuitOpenError: If the request must not be sent.
+    """
+    state = get_state()
+    if state == "closed":
+        return False
+
+    if state == "half-open":
+        reset_timeout = get_breaker_config()[1]
+        if frappe.cache().set(_key(PROBE_KEY), 1, nx=True, ex=reset_timeout):
+            return True
+
+    raise CircuitOpenError("FlyOut circuit breaker is open, request not sent")
+
+
+def release_probe():
+    """Give the probe slot back without an outcome, for a probe that was never sent"""
+    frappe.cache().delete(_key(PROBE_KEY))
+
+
+def record_success():
+    """Close the circuit after a successful request"""
+    was_open = _opened_at() is not None
+    frappe.cache().delete(_key(FAILURES_KEY), _key(OPENED_AT_KEY), _key(PROBE_KEY))
+
+    if was_open:
+        frappe.logger().info("FlyOut circuit breaker closed")
+        _set_sync_status("Active")
+
+
+def record_failure():
+    """Count a failed request and open the circuit once the threshold is reached"""
+    threshold, reset_timeout = get_breaker_config()
+    cache = frappe.cache()
+
+    if _opened_at() is not None:
+        # A failed half-open probe reopens the circuit for another reset timeout
+        cache.set(_key(OPENED_AT_KEY), time.time())
+        cache.delete(_key(PROBE_KEY))
+        return
+
+    failures = cache.incr(_key(FAILURES_KEY))
+    cache.expire(_key(FAILURES_KEY), reset_timeout * 10)
+
+    if failures >= threshold:
+        cache.set(_key(OPENED_AT_KEY), time.time())
+        frappe.log_error(
+            f"FlyOut circuit breaker opened after {failures} consecutive failures",
+            "FlyOut Circuit Breaker"
+        )
+        _set_sync_status("Error")
+
+
+def is_failure(exc):
+    """Return True if an exception means FlyOut is unhealthy (not a client-side 4xx)"""
+    if isinstance(exc, CircuitOpenError):
+        return False
+    response = getattr(exc, "response", None)
+    if response is not None and response.status_code < 500:
+        return False
+    return True
+
+
+def _set_sync_status(status):
+    """Reflect circuit transitions on FlyOut Account Settings (once per transition, not per call)"""
+    frappe.db.set_value("FlyOut Account Settings", "FlyOut Account Settings", "sync_status", status)
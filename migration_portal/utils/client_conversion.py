@@ -0,0 +1,227 @@
+import frappe
+from frappe import _
+from frappe.model.workflow import get_workflow_name
+
+from migration_portal.migration_portal.utils.sync_queue import request_outbound_sync, SYNC_WORKER_QUEUE
+
+# Client field -> Inquiry field copied on conversion
+# (not to be confused with sync_utils.CLIENT_FIELD_MAP, Client field -> FlyOut key)
+INQUIRY_TO_CLIENT_FIELDS = {
+    "linked_inquiry": "name",
+    "client_name": "applicant_name",
+    "email": "contact_email",
+    "phone": "contact_phone",
+    "service_type": "service_type",
+    "destination_country": "destination_country"
+}
+
+# Inquiry fields a conversion reads; bulk conversion fetches only these
+INQUIRY_FIELDS = sorted(set(INQUIRY_TO_CLIENT_FIELDS.values()) | {
+    "status", "linked_client", "assigned_to", "address", "inquiry_source", "flyout_inquiry_id"
+})
+
+# Inquiries converted per transaction by the bulk job
+CONVERSION_CHUNK_SIZE = 50
+
+# Largest selection converted in the request itself instead of a background job
+INLINE_CONVERSION_LIMIT = 10
+
+
+def get_client_values(inquiry, user=None):
+    """
+    Values of the Client created from an Inquiry.
+
+    Args:
+        inquiry (Document or dict): Inquiry document, or a row with the INQUIRY_FIELDS.
+        user (str, optional): Primary consultant if the inquiry is not assigned (defaults to the session user).
+
+    Returns:
+        dict: Client values, including "doctype".
+    """
+    values = {client_field: inquiry.get(inquiry_field) for client_field, inquiry_field in INQUIRY_TO_CLIENT_FIELDS.items()}
+    values.update({
+        "doctype": "Client",
+        "primary_consultant": inquiry.get("assigned_to") or user or frappe.session.user,
+        # Inquiry status moves to Converted through the workflow (or convert_inquiry in bulk)
+        "status": "Active"
+    })
+
+    # Map address (simple example)
+    if inquiry.get("address"):
+        address_parts = inquiry.get("address").split('\n')
+        values["address_line1"] = address_parts[0]
+        if len(address_parts) > 1:
+            values["address_line2"] = address_parts[1]
+        # TODO: Add more robust address parsing if needed (city, state, country, postal code)
+
+    return values
+
+
+def convert_inquiry(inquiry, user=None):
+    """
+    Create the Client of one Inquiry row and mark the Inquiry Converted, without loading the Inquiry.
+
+    Used by the bulk job, where no workflow action runs, so the status is set
+    here. FlyOut inquiries get their status change pushed under the same
+    rules as a saved Inquiry (see `request_outbound_sync`).
+
+    Args:
+        inquiry (dict): Row with the INQUIRY_FIELDS.
+        user (str, optional): Primary consultant for unassigned inquiries.
+
+    Returns:
+        str: Name of the new Client.
+    """
+    values = {"status": "Converted"}
+    workflow_state_field, converted_state = get_converted_workflow_state()
+    if workflow_state_field:
+        if not converted_state:
+            frappe.throw(_("The Inquiry workflow has no state that sets status to Converted"))
+        # Keep the workflow in step with the status, as the workflow action would
+        values[workflow_state_field] = converted_state
+
+    client = frappe.get_doc(get_client_values(inquiry, user))
+    client.insert(ignore_permissions=True)
+
+    values["linked_client"] = client.name
+    frappe.db.set_value("Inquiry", inquiry.name, values)
+
+    if inquiry.inquiry_source == "FlyOut" and inquiry.flyout_inquiry_id:
+        request_outbound_sync("Inquiry", inquiry.name, ["status"])
+
+    return client.name
+
+
+def get_converted_workflow_state():
+    """
+    Return (workflow_state_field, state) of the active Inquiry workflow's Converted state.
+
+    The state is the one that sets status to Converted (or is named Converted).
+    Returns (None, None) without an active workflow, and (field, None) if the
+    workflow has no such state.
+    """
+    workflow_name = get_workflow_name("Inquiry")
+    if not workflow_name:
+        return None, None
+
+    workflow = frappe.get_cached_doc("Workflow", workflow_name)
+    states = [s for s in workflow.states if s.update_field == "status" and s.update_value == "Converted"]
+    states = states or [s for s in workflow.states if s.state == "Converted"]
+    return workflow.workflow_state_field, states[0].state if states else None
+
+
+@frappe.whitelist(methods=["POST"])
+def convert_inquiries(names=None, filters=None):
+    """
+    Convert Inquiries to Clients in bulk.
+
+    Small selections are converted right away; larger ones in a background
+    job that reports progress to the caller. Only Inquiries that are
+    "Under Review" and not yet linked to a Client are converted.
+
+    Args:
+        names (list, optional): Inquiry names.
+        filters (dict, optional): Inquiry filters, used when no names are given.
+
+    Returns:
+        dict: {"queued": True} for a background job, else the conversion results.
+    """
+    frappe.only_for(["System Manager", "Migration Manager"])
+
+    names = frappe.parse_json(names) if isinstance(names, str) else names
+    filters = frappe.parse_json(filters) if isinstance(filters, str) else filters
+    if not names and filters is None:
+        frappe.throw(_("Select the Inquiries to convert or pass filters."))
+
+    if not names:
+        names = frappe.get_list("Inquiry", filters=filters, pluck="name", limit_page_length=0)
+
+    if len(names) <= INLINE_CONVERSION_LIMIT:
+        return convert_inquiries_in_chunks(names)
+
+    frappe.enqueue(
+        "migration_portal.migration_portal.utils.client_conversion.convert_inquiries_in_chunks",
+        queue=SYNC_WORKER_QUEUE,
+        timeout=3600,
+        names=names,
+        notify=True
+    )
+    return {"queued": True, "total": len(names)}
+
+
+def convert_inquiries_in_chunks(names, chunk_size=CONVERSION_CHUNK_SIZE, notify=False):
+    """
+    Background job: convert Inquiries to Clients, committing once per chunk.
+
+    Each chunk's Inquiries are read in one query (only the mapped fields).
+    Every conversion runs under its own savepoint, so one failing Inquiry is
+    reported and rolled back without losing the rest of its chunk. Progress
+    is published after each chunk and the outcome of every Inquiry is
+    returned.
+
+    Args:
+        names (list): Inquiry names.
+        chunk_size (int, optional): Inquiries per transaction.
+        notify (bool, optional): Also publish the outcome to the user when done
+            (set for background jobs; an inline caller gets it as the return value).
+
+    Returns:
+        dict: {"converted": int, "skipped": int, "failed": int, "results": [per-Inquiry outcome]}
+    """
+    user = frappe.session.user
+    results = []
+    total = len(names)
+
+    for start in range(0, total, chunk_size):
+        chunk = names[start:start + chunk_size]
+        # Lock the chunk's Inquiries so an interactive conversion cannot run at the same time
+        rows = {
+            row.name: row
+            for row in frappe.get_all(
+                "Inquiry",
+                filters={"name": ["in", chunk]},
+                fields=INQUIRY_FIELDS,
+                for_update=True
+            )
+        }
+
+        for name in chunk:
+            results.append(_convert_one(name, rows.get(name), user))
+
+        frappe.db.commit()
+        frappe.publish_progress(
+            min(start + chunk_size, total) * 100 / total,
+            title=_("Converting Inquiries"),
+            description=_("{0} of {1} Inquiries processed").format(min(start + chunk_size, total), total)
+        )
+
+    summary = {
+        "converted": sum(1 for r in results if r["status"] == "Converted"),
+        "skipped": sum(1 for r in results if r["status"] == "Skipped"),
+        "failed": sum(1 for r in results if r["status"] == "Failed"),
+        "results": results
+    }
+    if notify:
+        frappe.publish_realtime("inquiry_conversion_complete", summary, user=user)
+    return summary
+
+
+def _convert_one(name, inquiry, user):
+    """Convert one Inquiry row under a savepoint and return its outcome"""
+    if not inquiry:
+        return {"inquiry": name, "status": "Skipped", "message": _("Not found")}
+    if inquiry.linked_client:
+        return {"inquiry": name, "status": "Skipped", "client": inquiry.linked_client, "message": _("Already converted")}
+    if inquiry.status != "Under Review":
+        return {"inquiry": name, "status": "Skipped", "message": _("Status is {0}").format(inquiry.status)}
+
+    frappe.db.savepoint("convert_inquiry")
+    try:
+        client = convert_inquiry(inquiry, user)
+    except Exception as e:
+        frappe.db.rollback(save_point="convert_inquiry")
+        frappe.clear_messages()
+        frappe.log_error(frappe.get_traceback(), "Client Conversion Error")
+        return {"inquiry": name, "status": "Failed", "message": str(e)}
+
+    return {"inquiry": name, "status": "Converted", "client": client}
@@ -0,0 +1,157 @@
+import re
+
+import frappe
+from frappe import _
+from frappe.utils import now_datetime
+
+from migration_portal.migration_portal.utils import sync_metrics
+from migration_portal.migration_portal.utils.sync_queue import enqueue_outbound_sync, wake_outbound_worker, SYNC_WORKER_QUEUE
+
+# Dead letters re-queued per transaction by the replay job
+REPLAY_CHUNK_SIZE = 500
+
+# "422 Client Error: ..." as raised by requests' raise_for_status
+HTTP_STATUS_PATTERN = re.compile(r"^(\d{3}) (Client|Server) Error")
+
+
+def classify_error(error_type=None, message=None):
+    """Group key for a failure: "HTTP <status>" for HTTP errors, otherwise the exception name"""
+    match = HTTP_STATUS_PATTERN.match(message or "")
+    if match:
+        return f"HTTP {match.group(1)}"
+    return error_type or "Unknown"
+
+
+def record_dead_letter(doctype, docname, sync_log=None, error=None, error_type=None, attempts=0):
+    """
+    Park a document whose sync exhausted its retries.
+
+    There is one open entry per document: a document that fails again after
+    a replay reopens its existing entry instead of adding another.
+
+    Args:
+        doctype (str): DocType name.
+        docname (str): Document name.
+        sync_log (str, optional): Last failed Sync Log.
+        error (str, optional): Last error message.
+        error_type (str, optional): Exception class name of the last error.
+        attempts (int, optional): Number of attempts made.
+
+    Returns:
+        str: Name of the FlyOut Dead Letter entry.
+    """
+    values = {
+        "status": "Open",
+        "sync_log": sync_log,
+        "error_type": classify_error(error_type, error),
+        "error_message": error,
+        "attempts": attempts,
+        "dead_lettered_at": now_datetime()
+    }
+    frappe.db.after_commit.add(
+        lambda: sync_metrics.incr("dead_lettered_total", doctype=doctype, error_type=values["error_type"])
+    )
+
+    existing = frappe.db.get_value(
+        "FlyOut Dead Letter",
+        {"reference_doctype": doctype, "reference_name": docname, "status": ["!=", "Resolved"]}
+    )
+    if existing:
+        frappe.db.set_value("FlyOut Dead Letter", existing, values)
+        return existing
+
+    entry = frappe.get_doc(dict(values, doctype="FlyOut Dead Letter", reference_doctype=doctype, reference_name=docname))
+    entry.insert(ignore_permissions=True)
+    return entry.name
+
+
+@frappe.whitelist()
+def get_dead_letter_summary():
+    """Open dead letters grouped by error type, largest group first"""
+    frappe.only_for(["System Manager", "Migration Manager"])
+
+    return frappe.get_all(
+        "FlyOut Dead Letter",
+        filters={"status": "Open"},
+        fields=["error_type", "count(name) as count"],
+        group_by="error_type",
+        order_by="count desc"
+    )
+
+
+@frappe.whitelist()
+def replay_dead_letters(error_type=None, names=None):
+    """
+    Re-push open dead letters through the outbound queue in a background job.
+
+    Args:
+        error_type (str, optional): Only replay this error group.
+        names (list, optional): Only replay these entries.
+
+    Returns:
+        str: Message for the user.
+    """
+    frappe.only_for(["System Manager", "Migration Manager"])
+
+    if isinstance(names, str):
+        names = frappe.parse_json(names)
+
+    frappe.enqueue(
+        "migration_portal.migration_portal.utils.dead_letter.requeue_dead_letters",
+        queue=SYNC_WORKER_QUEUE,
+        timeout=3600,
+        error_type=error_type,
+        names=names
+    )
+    return _("Replay started. Entries are marked Resolved once FlyOut accepts them.")
+
+
+def requeue_dead_letters(error_type=None, names=None, chunk_size=REPLAY_CHUNK_SIZE):
+    """
+    Background job: hand open dead letters back to the outbound queue, in chunks.
+
+    Nothing is sent from here: the queue worker pushes them under the shared
+    rate limiter and circuit breaker. Each document gets a full push since its
+    earlier changed fields are no longer known.
+
+    Returns:
+        int: Number of entries re-queued.
+    """
+    filters = {"status": "Open"}
+    if error_type:
+        filters["error_type"] = error_type
+    if names:
+        filters["name"] = ["in", names]
+
+    requeued = 0
+    while True:
+        # Re-queued entries leave the filter, so always take the first chunk
+        entries = frappe.get_all(
+            "FlyOut Dead Letter",
+            filters=filters,
+            fields=["name", "reference_doctype", "reference_name"],
+            order_by="creation asc",
+            limit=chunk_size
+        )
+        if not entries:
+            break
+
+        for entry in entries:
+            enqueue_outbound_sync(entry.reference_doctype, entry.reference_name)
+
+        frappe.db.set_value(
+            "FlyOut Dead Letter",
+            {"name": ["in", [e.name for e in entries]]},
+            {"status": "Replay Queued", "replayed_at": now_datetime()}
+        )
+        frappe.db.commit()
+        requeued += len(entries)
+
+        if len(entries) < chunk_size:
+            break
+
+    if requeued:
+        wake_outbound_worker()
+        frappe.db.commit()
+
+    return requeued
@@ -0,0 +1,116 @@
+from zoneinfo import ZoneInfo
+
+import frappe
+from frappe.utils import get_datetime, get_system_timezone
+
+# Redis key prefix (site-prefixed through frappe.cache().make_key)
+VERSION_KEY_PREFIX = "flyout_inquiry_version"
+
+# How long (seconds) the last applied version of an inquiry is kept in Redis.
+# The Inquiry row is the source of truth; Redis only saves the lookup.
+VERSION_TTL = 7 * 24 * 60 * 60
+
+# Store ARGV[1] unless a newer version is already stored, so concurrent commits cannot move it back
+SET_IF_NEWER_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]))
+if not current or current < tonumber(ARGV[1]) then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', tonumber(ARGV[2]))
+end
+return 1
+"""
+
+_scripts = {}
+
+
+def _key(inquiry_id):
+    return frappe.cache().make_key(f"{VERSION_KEY_PREFIX}:{inquiry_id}")
+
+
+def get_event_timestamp(data):
+    """
+    Return the FlyOut timestamp of an event (updated_at, else created_at), or None if it has none.
+
+    ISO values with an offset ("...Z", "+05:30") are converted to naive system
+    time, the form Datetime columns are stored and compared in.
+    """
+    value = data.get("updated_at") or data.get("created_at")
+    if not value:
+        return None
+
+    event_ts = get_datetime(value)
+    if event_ts.tzinfo:
+        event_ts = event_ts.astimezone(ZoneInfo(get_system_timezone())).replace(tzinfo=None)
+    return event_ts
+
+
+def is_stale_event(inquiry_id, event_ts, inclusive=False):
+    """
+    Return True if an event is older than the last one applied to the inquiry.
+
+    Redis is checked first, so most stale events never reach the database.
+    Otherwise the inquiry's row is locked and its `flyout_updated_at` read
+    (one indexed column, the document is not loaded). The lock is held until
+    the caller commits, so workers applying events for the same inquiry are
+    serialised and cannot overwrite a newer state with an older one.
+
+    Events without a timestamp are never considered stale.
+
+    Args:
+        inquiry_id (str): FlyOut inquiry ID.
+        event_ts (datetime): Timestamp from `get_event_timestamp`.
+        inclusive (bool, optional): Also treat an event as old as the applied state as stale
+            (reconciliation, where that event has already been applied).
+    """
+    if not event_ts or not inquiry_id:
+        return False
+
+    cached = frappe.cache().get(_key(inquiry_id))
+    if cached and (event_ts.timestamp() <= float(cached) if inclusive else event_ts.timestamp() < float(cached)):
+        return True
+
+    current = frappe.db.sql(
+        "select flyout_updated_at from `tabInquiry` where flyout_inquiry_id = %s for update",
+        inquiry_id
+    )
+    current = current[0][0] if current else None
+    if not current:
+        return False
+    current = get_datetime(current)
+    return event_ts <= current if inclusive else event_ts < current
+
+
+def record_applied_version(inquiry_name, inquiry_id, event_ts):
+    """
+    Store the timestamp of the event just applied to an inquiry.
+
+    The UPDATE is conditional, so the stored version only ever moves forward.
+    Redis is updated once the transaction commits.
+    """
+    if not event_ts:
+        return
+
+    frappe.db.sql(
+        """
+        update `tabInquiry` set flyout_updated_at = %(ts)s
+        where name = %(name)s and (flyout_updated_at is null or flyout_updated_at < %(ts)s)
+        """,
+        {"ts": event_ts, "name": inquiry_name}
+    )
+
+    frappe.db.after_commit.add(lambda: _cache_version(inquiry_id, event_ts))
+
+
+def _cache_version(inquiry_id, event_ts):
+    script = _scripts.get("set_if_newer")
+    if script is None:
+        script = _scripts["set_if_newer"] = frappe.cache().register_script(SET_IF_NEWER_SCRIPT)
+    script(keys=[_key(inquiry_id)], args=[event_ts.timestamp(), VERSION_TTL])
+
+
+def stale_response(data):
+    """Response returned to FlyOut for an event older than the applied state"""
+    return {
+        "success": True,
+        "stale": True,
+        "message": f"Event for FlyOut Inquiry ID {data.get('inquiry_id', 'N/A')} is older than the applied state, ignored"
+    }
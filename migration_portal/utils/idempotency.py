@@ -0,0 +1,113 @@
+import hashlib
+import json
+
+import frappe
+from frappe.utils import cint
+
+# Redis key prefix (site-prefixed through frappe.cache().make_key)
+SEEN_KEY_PREFIX = "flyout_webhook_seen"
+
+# Request header FlyOut sends with a delivery ID that stays the same across redeliveries
+DELIVERY_ID_HEADER = "X-FlyOut-Delivery-ID"
+
+# Default time (seconds) a delivery is remembered when the setting is empty
+DEFAULT_TTL = 24 * 60 * 60
+
+# How long (seconds) a claim is held before its transaction commits; longer than
+# any request or background job that applies webhooks
+PENDING_TTL = 15 * 60
+
+
+def get_dedupe_ttl(settings=None):
+    """Return how long (seconds) inbound deliveries are remembered, 0 disables deduplication"""
+    if not settings:
+        settings = frappe.get_cached_doc("FlyOut Account Settings")
+    value = settings.get("webhook_dedupe_ttl")
+    return DEFAULT_TTL if value is None else max(cint(value), 0)
+
+
+def get_idempotency_key(event_type, data, use_header=True):
+    """
+    Return the idempotency key of an inbound FlyOut event.
+
+    FlyOut's delivery ID header is used when present, otherwise a hash of the
+    canonical payload, so a redelivered body maps to the same key.
+
+    Args:
+        event_type (str): Event type, e.g. "Inquiry" or "Status Update".
+        data (dict): Webhook payload.
+        use_header (bool, optional): Set to False when one request carries several events.
+
+    Returns:
+        str: Redis key for the event.
+    """
+    delivery_id = frappe.get_request_header(DELIVERY_ID_HEADER) if use_header and frappe.request else None
+    if delivery_id:
+        token = f"id:{delivery_id}"
+    else:
+        canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+        token = "sha256:" + hashlib.sha256(canonical.encode()).hexdigest()
+
+    return frappe.cache().make_key(f"{SEEN_KEY_PREFIX}:{event_type}:{token}")
+
+
+def claim_event(key, settings=None):
+    """
+    Mark an event as seen.
+
+    The claim is provisional until the current transaction commits: it is
+    held for PENDING_TTL only, extended to the dedupe TTL after commit and
+    dropped on rollback. A worker that is killed mid-way therefore blocks
+    FlyOut's redelivery for minutes, not for the whole TTL.
+
+    Returns:
+        bool: True if the event is new and should be applied, False if it is a replay.
+    """
+    ttl = get_dedupe_ttl(settings)
+    if not ttl:
+        return True
+    if not frappe.cache().set(key, 1, nx=True, ex=min(PENDING_TTL, ttl)):
+        return False
+
+    pending = frappe.local.flags.get("flyout_claimed_events")
+    if pending is None:
+        pending = frappe.local.flags.flyout_claimed_events = {}
+        frappe.db.after_commit.add(_confirm_claims)
+        frappe.db.after_rollback.add(_release_claims)
+    pending[key] = ttl
+    return True
+
+
+def release_event(key):
+    """Forget an event whose processing failed, so FlyOut's redelivery is applied"""
+    if key:
+        (frappe.local.flags.get("flyout_claimed_events") or {}).pop(key, None)
+        frappe.cache().delete(key)
+
+
+def _confirm_claims():
+    """Keep the claims of a committed transaction for the full dedupe TTL"""
+    pending = frappe.local.flags.pop("flyout_claimed_events", None)
+    if not pending:
+        return
+
+    pipe = frappe.cache().pipeline()
+    for key, ttl in pending.items():
+        pipe.set(key, 1, ex=ttl)
+    pipe.execute()
+
+
+def _release_claims():
+    """Drop the claims of a rolled back transaction (including a failed commit)"""
+    pending = frappe.local.flags.pop("flyout_claimed_events", None)
+    if pending:
+        frappe.cache().delete(*pending)
+
+
+def duplicate_response(data):
+    """Response returned to FlyOut for a replayed delivery"""
+    return {
+        "success": True,
+        "duplicate": True,
+        "message": f"Duplicate delivery for FlyOut Inquiry ID {data.get('inquiry_id', 'N/A')} ignored"
+    }
@@ -0,0 +1,186 @@
+import frappe
+from frappe.utils import now_datetime
+
+
+def add_link(parenttype, parent, parentfield, link_field, link_name):
+    """Add one link row, see `add_links`. Returns True if a row was inserted."""
+    return bool(add_links(parenttype, parentfield, link_field, [(parent, link_name)]))
+
+
+def remove_link(parenttype, parent, parentfield, link_field, link_name):
+    """Remove one link row, see `remove_links`. Returns True if a row was deleted."""
+    return bool(remove_links(parenttype, parentfield, link_field, [(parent, link_name)]))
+
+
+def add_links(parenttype, parentfield, link_field, pairs):
+    """
+    Insert link rows (e.g. Migration Payment Reference) into parents' child tables
+    without loading or saving the parents.
+
+    The parents are row-locked first (in name order, so concurrent callers
+    cannot deadlock), rows that already exist are skipped and the others are
+    written with one multi-row INSERT, `fetch_from` fields filled from the
+    linked documents. Each changed parent gets its `modified` bumped so open
+    forms reload.
+
+    Args:
+        parenttype (str): Parent DocType, e.g. "Client".
+        parentfield (str): Table field on the parent, e.g. "payments".
+        link_field (str): Link field in the child table, e.g. "payment".
+        pairs (list): (parent name, linked document name) tuples; any number of parents.
+
+    Returns:
+        int: Number of rows inserted (0 if the parent has no such table).
+    """
+    child_doctype = _get_child_doctype(parenttype, parentfield)
+    pairs = {(parent, link) for parent, link in pairs if parent and link}
+    if not child_doctype or not pairs:
+        return 0
+
+    docstatus = _lock_parents(parenttype, {parent for parent, _ in pairs})
+    pairs = {pair for pair in pairs if pair[0] in docstatus}
+
+    # Idempotent: skip rows that are already there
+    existing = {
+        (row.parent, row.get(link_field))
+        for row in frappe.get_all(
+            child_doctype,
+            filters={
+                "parenttype": parenttype,
+                "parentfield": parentfield,
+                "parent": ["in", list({parent for parent, _ in pairs})],
+                link_field: ["in", list({link for _, link in pairs})]
+            },
+            fields=["parent", link_field]
+        )
+    }
+    pairs = sorted(pairs - existing)
+    if not pairs:
+        return 0
+
+    parents = list({parent for parent, _ in pairs})
+    next_idx = {
+        row.parent: row.idx
+        for row in frappe.get_all(
+            child_doctype,
+            filters={"parenttype": parenttype, "parentfield": parentfield, "parent": ["in", parents]},
+            fields=["parent", "max(idx) as idx"],
+            group_by="parent"
+        )
+    }
+
+    fetched = _get_fetch_values(child_doctype, link_field, {link for _, link in pairs})
+
+    now = now_datetime()
+    rows = []
+    for parent, link in pairs:
+        next_idx[parent] = (next_idx.get(parent) or 0) + 1
+        rows.append(dict(
+            fetched.get(link, {}),
+            name=frappe.generate_hash(length=10),
+            creation=now,
+            modified=now,
+            owner=frappe.session.user,
+            modified_by=frappe.session.user,
+            docstatus=docstatus[parent],
+            idx=next_idx[parent],
+            parent=parent,
+            parenttype=parenttype,
+            parentfield=parentfield,
+            **{link_field: link}
+        ))
+
+    fields = sorted({f for row in rows for f in row})
+    frappe.db.bulk_insert(child_doctype, fields, [tuple(row.get(f) for f in fields) for row in rows])
+
+    _touch_parents(parenttype, parents, now)
+    return len(rows)
+
+
+def remove_links(parenttype, parentfield, link_field, pairs):
+    """
+    Delete link rows from parents' child tables without loading or saving the parents.
+
+    Parents are row-locked as in `add_links`; removing a row that is not there
+    is a no-op.
+
+    Args:
+        parenttype (str): Parent DocType, e.g. "Client".
+        parentfield (str): Table field on the parent, e.g. "payments".
+        link_field (str): Link field in the child table, e.g. "payment".
+        pairs (list): (parent name, linked document name) tuples.
+
+    Returns:
+        int: Number of rows deleted.
+    """
+    child_doctype = _get_child_doctype(parenttype, parentfield)
+    pairs = {(parent, link) for parent, link in pairs if parent and link}
+    if not child_doctype or not pairs:
+        return 0
+
+    by_parent = {}
+    for parent, link in pairs:
+        by_parent.setdefault(parent, []).append(link)
+
+    _lock_parents(parenttype, set(by_parent))
+
+    rows = frappe.get_all(
+        child_doctype,
+        filters={
+            "parenttype": parenttype,
+            "parentfield": parentfield,
+            "parent": ["in", list(by_parent)],
+            link_field: ["in", list({link for _, link in pairs})]
+        },
+        fields=["name", "parent", link_field]
+    )
+    rows = [row for row in rows if row.get(link_field) in by_parent[row.parent]]
+    if not rows:
+        return 0
+
+    frappe.db.delete(child_doctype, {"name": ["in", [row.name for row in rows]]})
+
+    _touch_parents(parenttype, list({row.parent for row in rows}), now_datetime())
+    return len(rows)
+
+
+def _get_child_doctype(parenttype, parentfield):
+    """Return the child DocType of a Table field, or None if the parent has no such table"""
+    field = frappe.get_meta(parenttype).get_field(parentfield)
+    if not field or field.fieldtype != "Table":
+        return None
+    return field.options
+
+
+def _lock_parents(parenttype, parents):
+    """Lock the parent rows (in name order) and return {name: docstatus} for those that exist"""
+    rows = frappe.db.sql(
+        f"select name, docstatus from `tab{parenttype}` where name in %(names)s order by name for update",
+        {"names": tuple(sorted(parents))}
+    )
+    return dict(rows)
+
+
+def _get_fetch_values(child_doctype, link_field, links):
+    """Values of the child's `fetch_from` fields that read through `link_field`, per linked document"""
+    fetch_map = {}
+    for df in frappe.get_meta(child_doctype).fields:
+        source_link, _, source_field = (df.fetch_from or "").partition(".")
+        if source_link == link_field and source_field:
+            fetch_map[df.fieldname] = source_field
+    if not fetch_map:
+        return {}
+
+    link_doctype = frappe.get_meta(child_doctype).get_field(link_field).options
+    return {
+        row.name: {fieldname: row.get(source) for fieldname, source in fetch_map.items()}
+        for row in frappe.get_all(
+            link_doctype,
+            filters={"name": ["in", list(links)]},
+            fields=["name"] + list(set(fetch_map.values()))
+        )
+    }
+
+
+def _touch_parents(parenttype, parents, now):
+    frappe.db.set_value(parenttype, {"name": ["in", parents]}, "modified", now, update_modified=False)
@@ -0,0 +1,26 @@
+import os
+import time
+
+# Crockford base32 (no I, L, O, U): sorts the same as a string and as a number
+ULID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+
+def new_ulid():
+    """
+    Return a ULID: 48-bit millisecond timestamp + 80 random bits, 26 characters.
+
+    ULIDs sort by creation time and need no shared counter, so concurrent
+    workers can name rows without taking a lock.
+    """
+    value = (int(time.time() * 1000) << 80) | int.from_bytes(os.urandom(10), "big")
+
+    chars = []
+    for _ in range(26):
+        value, index = divmod(value, 32)
+        chars.append(ULID_ALPHABET[index])
+    return "".join(reversed(chars))
+
+
+def make_time_ordered_name(prefix):
+    """Time-sortable, collision-free document name, e.g. SYNC-01HZX3K4V5QJ8T9W2M6N7P0R1S"""
+    return f"{prefix}-{new_ulid()}"
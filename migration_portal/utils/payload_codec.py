@@ -0,0 +1,99 @@
+import base64
+import json
+import zlib
+
+import frappe
+from frappe.utils import cint
+
+# Prefix marking a zlib-compressed, base64-encoded value
+COMPRESSED_PREFIX = "zlib:"
+
+# Values shorter than this (bytes) are stored as is; compressing them saves nothing
+MIN_COMPRESS_SIZE = 256
+
+# Appended to a value cut at the size cap
+TRUNCATION_MARKER = "\n... [truncated {0} bytes]"
+
+# Sync Log fields holding payloads or traces
+PAYLOAD_FIELDS = ("request_data", "response_data", "stack_trace")
+
+
+def get_codec_config(settings=None):
+    """
+    Read the Sync Log payload storage settings.
+
+    Returns:
+        tuple: (compress, max_payload_bytes) where 0 bytes means no cap.
+    """
+    if not settings:
+        settings = frappe.get_cached_doc("FlyOut Account Settings")
+
+    max_kb = settings.get("sync_log_max_payload_kb")
+    return (
+        bool(cint(settings.get("compress_sync_log_payloads"))),
+        (256 if max_kb is None else max(cint(max_kb), 0)) * 1024
+    )
+
+
+def encode_payload(value, settings=None):
+    """
+    Serialise a payload for storage on a Sync Log.
+
+    Dicts and lists are written as compact JSON. Values above the size cap are
+    cut and marked as truncated. If compression is enabled, values that are
+    large enough are stored zlib-compressed and base64-encoded with a "zlib:"
+    prefix; `decode_payload` reverses this.
+
+    Returns:
+        str: Value to store, or None for an empty payload.
+    """
+    if value is None or value == "":
+        return None
+
+    if isinstance(value, (dict, list)):
+        text = json.dumps(value, separators=(",", ":"), default=str)
+    else:
+        text = str(value)
+
+    compress, max_bytes = get_codec_config(settings)
+
+    raw = text.encode()
+    if max_bytes and len(raw) > max_bytes:
+        text = raw[:max_bytes].decode(errors="ignore") + TRUNCATION_MARKER.format(len(raw) - max_bytes)
+        raw = text.encode()
+
+    if compress and len(raw) >= MIN_COMPRESS_SIZE:
+        packed = COMPRESSED_PREFIX + base64.b64encode(zlib.compress(raw, 6)).decode()
+        if len(packed) < len(raw):
+            return packed
+
+    return text
+
+
+def decode_payload(value, pretty=True):
+    """Return a stored Sync Log payload as text, JSON pretty-printed unless `pretty` is False"""
+    if not value:
+        return value
+
+    if value.startswith(COMPRESSED_PREFIX):
+        try:
+            value = zlib.decompress(base64.b64decode(value[len(COMPRESSED_PREFIX):])).decode()
+        except (ValueError, zlib.error):
+            return value
+
+    if not pretty:
+        return value
+
+    try:
+        return json.dumps(json.loads(value), indent=2)
+    except ValueError:
+        return value
+
+
+def decode_row(row, pretty=True):
+    """Decode the payload fields of a Sync Log row or document in place"""
+    for fieldname in PAYLOAD_FIELDS:
+        if row.get(fieldname):
+            # setattr works for both frappe._dict rows and Documents
+            setattr(row, fieldname, decode_payload(row.get(fieldname), pretty))
+    return row
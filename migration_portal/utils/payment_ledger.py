@@ -0,0 +1,208 @@
+import frappe
+from frappe import _
+from frappe.utils import flt, now_datetime
+
+# Balance field each submitted Migration Payment status counts towards; other statuses are not counted
+STATUS_BUCKETS = {
+    "Paid": "paid_amount",
+    "Partial": "paid_amount",
+    "Pending": "pending_amount",
+    "Refunded": "refunded_amount"
+}
+
+BALANCE_FIELDS = ("paid_amount", "pending_amount", "refunded_amount")
+
+BALANCE_ROLES = ["System Manager", "Migration Manager", "Finance Manager"]
+
+
+def get_balance_name(reference_type, reference_name, currency):
+    """Name of the Migration Payment Balance row of a party and currency"""
+    return f"{reference_type}-{reference_name}-{currency}"
+
+
+def apply_payment(payment, reverse=False):
+    """
+    Add a submitted Migration Payment to its party's balance, or take it out on cancel.
+
+    The balance row is created if missing (INSERT IGNORE, so concurrent first
+    payments of a party cannot collide) and incremented with a single UPDATE,
+    which is atomic under the row lock and commits or rolls back together
+    with the payment itself.
+
+    Args:
+        payment (Document): The Migration Payment being submitted or cancelled.
+        reverse (bool, optional): Subtract instead of add (on cancel).
+
+    Returns:
+        bool: True if a balance was changed.
+    """
+    field = STATUS_BUCKETS.get(payment.payment_status)
+    if not field or not payment.reference_type or not payment.reference_name or not payment.currency:
+        return False
+
+    name = get_balance_name(payment.reference_type, payment.reference_name, payment.currency)
+    now = now_datetime()
+
+    _insert_balances([{
+        "name": name,
+        "reference_type": payment.reference_type,
+        "reference_name": payment.reference_name,
+        "currency": payment.currency
+    }], now, ignore_duplicates=True)
+
+    sign = -1 if reverse else 1
+    frappe.db.sql(
+        f"""update `tabMigration Payment Balance`
+            set `{field}` = `{field}` + %(amount)s,
+                payment_count = payment_count + %(count)s,
+                modified = %(now)s,
+                modified_by = %(user)s
+            where name = %(name)s""",
+        {"amount": sign * flt(payment.amount), "count": sign, "now": now, "user": frappe.session.user, "name": name}
+    )
+    return True
+
+
+@frappe.whitelist()
+def get_payment_balance(reference_name, currency, reference_type="Client"):
+    """
+    Balance of one party in one currency, read by primary key.
+
+    Returns:
+        dict: paid_amount, pending_amount, refunded_amount and payment_count (zeros if the party has no payments).
+    """
+    frappe.only_for(BALANCE_ROLES)
+
+    balance = frappe.db.get_value(
+        "Migration Payment Balance",
+        get_balance_name(reference_type, reference_name, currency),
+        list(BALANCE_FIELDS) + ["payment_count"],
+        as_dict=True
+    )
+    return balance or frappe._dict({field: 0 for field in BALANCE_FIELDS + ("payment_count",)})
+
+
+@frappe.whitelist()
+def get_payment_balances(reference_names, reference_type="Client", currency=None):
+    """
+    Balances of one or more parties in every currency they paid in, in one query.
+
+    Args:
+        reference_names (str or list): Party name, or a list of names (e.g. a page of a report).
+        reference_type (str, optional): "Client" or "Inquiry".
+        currency (str, optional): Only this currency.
+
+    Returns:
+        dict: {party name: [balance rows, one per currency]}
+    """
+    frappe.only_for(BALANCE_ROLES)
+
+    if isinstance(reference_names, str):
+        reference_names = frappe.parse_json(reference_names) if reference_names.startswith("[") else [reference_names]
+
+    filters = {"reference_type": reference_type, "reference_name": ["in", reference_names]}
+    if currency:
+        filters["currency"] = currency
+
+    balances = {name: [] for name in reference_names}
+    for row in frappe.get_all(
+        "Migration Payment Balance",
+        filters=filters,
+        fields=["reference_name", "currency", "payment_count"] + list(BALANCE_FIELDS),
+        order_by="currency asc"
+    ):
+        balances[row.reference_name].append(row)
+    return balances
+
+
+@frappe.whitelist(methods=["POST"])
+def rebuild_payment_balances(reference_type=None, reference_name=None):
+    """
+    Recompute balances from submitted Migration Payments.
+
+    A single party is rebuilt right away; a full rebuild runs in a background job.
+    From the command line: `bench --site <site> execute
+    migration_portal.migration_portal.utils.payment_ledger.rebuild_balances`
+    """
+    frappe.only_for("System Manager")
+
+    if reference_name:
+        rebuild_balances(reference_type or "Client", reference_name)
+        return _("Payment balances of {0} rebuilt.").format(reference_name)
+
+    frappe.enqueue(
+        "migration_portal.migration_portal.utils.payment_ledger.rebuild_balances",
+        queue="long",
+        timeout=3600,
+        job_id="rebuild_payment_balances",
+        deduplicate=True,
+        reference_type=reference_type
+    )
+    return _("Rebuild of payment balances started.")
+
+
+def rebuild_balances(reference_type=None, reference_name=None):
+    """
+    Replace the balances in scope with totals aggregated from submitted Migration Payments.
+
+    The payments in scope are locked while the totals are read, so a payment
+    submitted or cancelled meanwhile waits and is applied on top of the
+    rebuilt row instead of being lost.
+
+    Args:
+        reference_type (str, optional): Only this party type.
+        reference_name (str, optional): Only this party (requires `reference_type`).
+
+    Returns:
+        int: Number of balance rows written.
+    """
+    filters = {}
+    if reference_type:
+        filters["reference_type"] = reference_type
+        if reference_name:
+            filters["reference_name"] = reference_name
+
+    conditions = "".join(f" and {field} = %({field})s" for field in filters)
+    sums = ",\n".join(
+        f"sum(case when payment_status in %({field})s then amount else 0 end) as {field}"
+        for field in BALANCE_FIELDS
+    )
+    values = dict(filters, statuses=tuple(STATUS_BUCKETS))
+    for field in BALANCE_FIELDS:
+        values[field] = tuple(status for status, bucket in STATUS_BUCKETS.items() if bucket == field)
+
+    totals = frappe.db.sql(
+        f"""select reference_type, reference_name, currency,
+                {sums},
+                count(*) as payment_count
+            from `tabMigration Payment`
+            where docstatus = 1 and payment_status in %(statuses)s{conditions}
+            group by reference_type, reference_name, currency
+            for update""",
+        values,
+        as_dict=True
+    )
+
+    frappe.db.delete("Migration Payment Balance", filters)
+
+    for row in totals:
+        row.name = get_balance_name(row.reference_type, row.reference_name, row.currency)
+    _insert_balances(totals, now_datetime())
+
+    return len(totals)
+
+
+def _insert_balances(rows, now, ignore_duplicates=False):
+    fields = ["name", "creation", "modified", "owner", "modified_by", "docstatus",
+        "reference_type", "reference_name", "currency", "payment_count"] + list(BALANCE_FIELDS)
+    user = frappe.session.user
+    frappe.db.bulk_insert(
+        "Migration Payment Balance",
+        fields,
+        [
+            (row["name"], now, now, user, user, 0, row["reference_type"], row["reference_name"], row["currency"],
+                row.get("payment_count") or 0, *(flt(row.get(field)) for field in BALANCE_FIELDS))
+            for row in rows
+        ],
+        ignore_duplicates=ignore_duplicates
+    )
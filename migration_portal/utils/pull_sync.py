@@ -0,0 +1,127 @@
+from datetime import timedelta
+
+import frappe
+from frappe.utils import get_datetime
+
+from migration_portal.migration_portal.api.flyout import process_inquiry_batch, create_sync_log
+from migration_portal.migration_portal.utils.event_ordering import get_event_timestamp
+from migration_portal.migration_portal.utils.sync_utils import make_api_request, update_sync_status
+
+# Number of inquiries requested from FlyOut per page
+PAGE_SIZE = 200
+
+
+def run_pull_sync():
+    """
+    Scheduler entry point: reconcile inquiries changed on FlyOut since the last pull.
+
+    Recovers anything a missed `receive_inquiry` webhook did not deliver.
+    """
+    settings = frappe.get_cached_doc("FlyOut Account Settings")
+    if not settings.enable_sync or not settings.enable_pull_sync:
+        return
+
+    pull_inquiries(settings)
+
+
+def pull_inquiries(settings=None, page_size=PAGE_SIZE):
+    """
+    Page through FlyOut's inquiry list from the stored cursor and apply every
+    page with the same mapping as `receive_inquiry`.
+
+    Pages are streamed one at a time and the cursor is saved after each page,
+    so memory stays flat and an interrupted run resumes where it stopped.
+    Items that fail to apply are recorded as Error Sync Logs by
+    process_inquiry_batch. Items no newer than the state already applied
+    (delivered by a webhook, or the item at the cursor on the previous run)
+    are skipped, so they do not add notes or Sync Logs again.
+
+    The cursor is the newest change seen so far in the whole run, so it does
+    not depend on FlyOut returning pages in `updated_at` order. Once an item
+    fails, the cursor stops just before the earliest failed change, so the
+    next run requests that item again; later pages are still applied and
+    re-requested items that did apply are skipped as already applied.
+
+    Args:
+        settings (Document, optional): FlyOut Account Settings document.
+        page_size (int, optional): Inquiries requested per page.
+
+    Returns:
+        dict: Number of inquiries applied, skipped and failed.
+    """
+    if not settings:
+        settings = frappe.get_cached_doc("FlyOut Account Settings")
+
+    endpoint = f"{settings.flyout_base_url}/providers/inquiries"
+    applied = skipped = failed = 0
+    newest = earliest_failed = None
+
+    try:
+        for page in iter_inquiry_pages(settings, settings.pull_sync_cursor, page_size):
+            results = process_inquiry_batch(page, endpoint=endpoint, skip_applied=True)
+            skipped += len([r for r in results if r.get("action") == "stale"])
+            applied += len([r for r in results if r["success"] and r.get("action") != "stale"])
+            failed += len([r for r in results if not r["success"]])
+
+            # Results come back in payload order
+            for item, result in zip(page, results):
+                event_ts = get_event_timestamp(item) if isinstance(item, dict) else None
+                if not event_ts:
+                    continue
+                if not result["success"]:
+                    earliest_failed = min(earliest_failed or event_ts, event_ts)
+                newest = max(newest or event_ts, event_ts)
+
+            cursor = newest
+            if earliest_failed:
+                # Stop short of the first failure so it is pulled again next run
+                cursor = min(cursor, earliest_failed - timedelta(seconds=1))
+            if cursor:
+                frappe.db.set_single_value("FlyOut Account Settings", "pull_sync_cursor", cursor)
+                frappe.db.commit()
+    except Exception as e:
+        frappe.log_error(f"FlyOut pull sync failed: {e}\n{frappe.get_traceback()}", "FlyOut Pull Sync Error")
+        create_sync_log("Inbound", "Error", "Inquiry", error_message=str(e), endpoint=endpoint, method="GET")
+        update_sync_status(settings, "Error")
+        frappe.db.commit()
+
+    return {"applied": applied, "skipped": skipped, "failed": failed}
+
+
+def iter_inquiry_pages(settings, updated_since=None, page_size=PAGE_SIZE):
+    """
+    Generator over FlyOut's inquiry list, one page (list of inquiry payloads) at a time.
+
+    Expected FlyOut response format:
+    {
+        "data": [{"inquiry_id": "FL-12345", ..., "updated_at": "2023-05-20T12:34:56"}],
+        "next_cursor": "opaque-cursor-or-null"
+    }
+
+    Args:
+        settings (Document): FlyOut Account Settings document.
+        updated_since (datetime, optional): Only inquiries changed after this time.
+        page_size (int, optional): Inquiries requested per page.
+    """
+    endpoint = f"{settings.flyout_base_url}/providers/inquiries"
+    headers = {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {settings.get_password('api_key')}"
+    }
+
+    params = {"limit": page_size}
+    if updated_since:
+        params["updated_since"] = get_datetime(updated_since).isoformat()
+
+    while True:
+        response = make_api_request("GET", endpoint, headers, params)
+        body = response.json() if response.text else {}
+
+        page = body.get("data") or []
+        if page:
+            yield page
+
+        next_cursor = body.get("next_cursor")
+        if not next_cursor or not page:
+            return
+        params["cursor"] = next_cursor
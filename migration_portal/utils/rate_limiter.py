@@ -0,0 +1,175 @@
+import time
+import uuid
+from email.utils import parsedate_to_datetime
+
+import frappe
+import requests
+from frappe.utils import cint, flt
+
+# Redis keys (site-prefixed through frappe.cache().make_key)
+BUCKET_KEY = "flyout_rate_bucket"
+SLOTS_KEY = "flyout_rate_slots"
+BLOCKED_UNTIL_KEY = "flyout_rate_blocked_until"
+
+# Longest a caller waits in-process for a token or slot before deferring the push instead
+MAX_INLINE_WAIT = 1.0
+
+# A concurrency slot is released automatically if its holder dies mid-request
+SLOT_TTL = 120
+
+# Refill the bucket and take one token. Returns "0" on success, otherwise the
+# seconds until a token is available (no token is taken in that case).
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(now - ts, 0) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 60)
+return tostring(wait)
+"""
+
+# Take a concurrency slot if fewer than ARGV[1] are held. Expired slots are dropped first.
+ACQUIRE_SLOT_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[1]) then
+    redis.call('ZADD', KEYS[1], now + tonumber(ARGV[2]), ARGV[3])
+    redis.call('EXPIRE', KEYS[1], tonumber(ARGV[2]))
+    return 1
+end
+return 0
+"""
+
+_scripts = {}
+
+
+class RateLimitedError(requests.exceptions.RequestException):
+    """Raised when a FlyOut call must wait for the rate limit; `retry_after` is in seconds"""
+
+    def __init__(self, message, retry_after=None, **kwargs):
+        super().__init__(message, **kwargs)
+        self.retry_after = retry_after
+
+
+def get_limits(settings=None):
+    """
+    Read the outbound rate limits (0 disables a limit).
+
+    Returns:
+        tuple: (requests_per_second, burst, max_concurrent_requests)
+    """
+    if not settings:
+        settings = frappe.get_cached_doc("FlyOut Account Settings")
+
+    rate = flt(settings.get("rate_limit_per_second"))
+    burst = cint(settings.get("rate_limit_burst")) or max(int(rate), 1)
+    return rate, burst, cint(settings.get("max_concurrent_requests"))
+
+
+def _key(key):
+    return frappe.cache().make_key(key)
+
+
+def _script(name, source):
+    script = _scripts.get(name)
+    if script is None:
+        script = _scripts[name] = frappe.cache().register_script(source)
+    return script
+
+
+def get_blocked_for():
+    """Seconds FlyOut asked us to back off for (via 429 / Retry-After), 0 if not blocked"""
+    value = frappe.cache().get(_key(BLOCKED_UNTIL_KEY))
+    if not value:
+        return 0
+    return max(float(value) - time.time(), 0)
+
+
+def is_blocked():
+    """Return True while FlyOut's Retry-After window is in effect"""
+    return get_blocked_for() > 0
+
+
+def block_for(seconds):
+    """Stop all workers from calling FlyOut for `seconds` (from a 429 / Retry-After)"""
+    seconds = max(flt(seconds), 1)
+    frappe.cache().set(_key(BLOCKED_UNTIL_KEY), time.time() + seconds, ex=int(seconds) + 1)
+
+
+def acquire(settings=None):
+    """
+    Wait for a token and a concurrency slot before calling FlyOut.
+
+    Waits in-process for at most MAX_INLINE_WAIT seconds; longer waits raise
+    RateLimitedError so the caller can defer the push instead of holding a
+    worker.
+
+    Returns:
+        str: Slot token to pass to `release` (None if concurrency is unlimited).
+
+    Raises:
+        RateLimitedError: If no capacity is available soon enough.
+    """
+    blocked_for = get_blocked_for()
+    if blocked_for:
+        raise RateLimitedError("FlyOut rate limit in effect (Retry-After)", retry_after=blocked_for)
+
+    rate, burst, max_concurrent = get_limits(settings)
+    deadline = time.monotonic() + MAX_INLINE_WAIT
+
+    if rate > 0:
+        bucket = _script("bucket", TOKEN_BUCKET_SCRIPT)
+        while True:
+            wait = float(bucket(keys=[_key(BUCKET_KEY)], args=[rate, burst]))
+            if not wait:
+                break
+            if time.monotonic() + wait > deadline:
+                raise RateLimitedError("FlyOut outbound rate limit reached", retry_after=wait)
+            time.sleep(wait)
+
+    if max_concurrent <= 0:
+        return None
+
+    slot = uuid.uuid4().hex
+    slots = _script("slots", ACQUIRE_SLOT_SCRIPT)
+    while not slots(keys=[_key(SLOTS_KEY)], args=[max_concurrent, SLOT_TTL, slot]):
+        if time.monotonic() >= deadline:
+            raise RateLimitedError("Too many concurrent FlyOut requests", retry_after=MAX_INLINE_WAIT)
+        time.sleep(0.05)
+
+    return slot
+
+
+def release(slot):
+    """Give back a concurrency slot taken by `acquire`"""
+    if slot:
+        frappe.cache().zrem(_key(SLOTS_KEY), slot)
+
+
+def parse_retry_after(response, default=60):
+    """Return the Retry-After header of a response in seconds (delta or HTTP date)"""
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return default
+
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        return default
@@ -0,0 +1,201 @@
+import json
+import time
+
+import frappe
+from frappe.utils import cint, now_datetime
+
+# Buffered rows wait in the Sync Log Buffer table: a cache key would not survive
+# eviction, a Redis restart or the clear-cache run by every migrate
+BUFFER_DOCTYPE = "Sync Log Buffer"
+
+# Redis keys (site-prefixed through frappe.cache().make_key); losing them only delays a flush
+PENDING_COUNT_KEY = "flyout_sync_log_pending_count"
+FLUSH_LOCK_KEY = "flyout_sync_log_flush_lock"
+LAST_FLUSH_KEY = "flyout_sync_log_last_flush"
+
+# A flush holding the lock longer than this (seconds) is assumed dead
+FLUSH_LOCK_TIMEOUT = 300
+
+# Upper bound on rows moved per flush step
+MAX_FLUSH_SIZE = 5000
+
+
+def _key(key):
+    return frappe.cache().make_key(key)
+
+
+def get_buffer_config(settings=None):
+    """
+    Read the Sync Log buffering settings.
+
+    Returns:
+        tuple: (enabled, flush_size, flush_interval_minutes)
+    """
+    if not settings:
+        settings = frappe.get_cached_doc("FlyOut Account Settings")
+
+    return (
+        bool(cint(settings.get("buffer_sync_logs"))),
+        min(cint(settings.get("sync_log_flush_size")) or 500, MAX_FLUSH_SIZE),
+        cint(settings.get("sync_log_flush_interval")) or 1
+    )
+
+
+def prepare_sync_log_row(log):
+    """
+    Name and timestamp an unsaved Sync Log and return the row to insert.
+
+    Logs that already carry a name keep it, so a row that is inserted twice
+    (e.g. re-flushed after a crash) is recognised as a duplicate.
+    """
+    if not log.name:
+        log.set_new_name()
+    log.set_user_and_timestamp()
+    log.docstatus = 0
+    log.idx = 0
+    return log.get_valid_dict(convert_dates_to_str=True)
+
+
+def insert_sync_log_rows(rows):
+    """Insert Sync Log rows with one multi-row INSERT, skipping names that already exist"""
+    if not rows:
+        return
+
+    fields = sorted({f for row in rows for f in row})
+    frappe.db.bulk_insert(
+        "Sync Log", fields, [tuple(row.get(f) for f in fields) for row in rows],
+        ignore_duplicates=True
+    )
+
+
+def buffer_sync_log(log):
+    """
+    Stage a Sync Log for the background flush instead of inserting it.
+
+    The row is written to Sync Log Buffer as one narrow, unindexed row in the
+    current transaction, so it is as durable as the operation it records and
+    disappears with it on rollback. The flush moves it to Sync Log in
+    multi-row inserts.
+
+    Args:
+        log (Document): Unsaved Sync Log, e.g. from `build_sync_log`.
+
+    Returns:
+        str: Name the log will have once flushed.
+    """
+    # Named now (see SyncLog.autoname) so a re-flushed row is recognised as a duplicate
+    log.set_new_name()
+    row = json.dumps(prepare_sync_log_row(log), default=str)
+
+    now = now_datetime()
+    frappe.db.bulk_insert(
+        BUFFER_DOCTYPE,
+        ["name", "creation", "modified", "owner", "modified_by", "docstatus", "row_data"],
+        [(log.name, now, now, frappe.session.user, frappe.session.user, 0, row)]
+    )
+
+    if not frappe.local.flags.get("flyout_buffered_sync_logs"):
+        frappe.db.after_commit.add(_count_pending)
+        frappe.db.after_rollback.add(_discard_pending)
+    frappe.local.flags.flyout_buffered_sync_logs = frappe.local.flags.get("flyout_buffered_sync_logs", 0) + 1
+
+    return log.name
+
+
+def _count_pending():
+    """Start a flush early once a full batch is waiting (the count is only a hint, the table is the buffer)"""
+    count = frappe.local.flags.pop("flyout_buffered_sync_logs", None)
+    if not count:
+        return
+
+    try:
+        pending = frappe.cache().incrby(_key(PENDING_COUNT_KEY), count)
+    except Exception:
+        return
+
+    if pending >= get_buffer_config()[1]:
+        frappe.enqueue(
+            "migration_portal.migration_portal.utils.sync_log_buffer.flush_sync_logs",
+            queue="short",
+            job_id=f"flyout_sync_log_flush::{frappe.local.site}",
+            deduplicate=True
+        )
+
+
+def _discard_pending():
+    frappe.local.flags.pop("flyout_buffered_sync_logs", None)
+
+
+def get_buffer_depth():
+    """Number of staged Sync Logs waiting for the flush"""
+    return frappe.db.count(BUFFER_DOCTYPE)
+
+
+def run_sync_log_flush():
+    """Scheduler entry point: flush the buffer once the configured interval has passed"""
+    interval = get_buffer_config()[2] * 60
+    last_flush = frappe.cache().get(_key(LAST_FLUSH_KEY))
+
+    # Allow a few seconds of scheduler jitter so a 1 minute interval runs every tick
+    if last_flush and time.time() - float(last_flush) < interval - 5:
+        return
+    flush_sync_logs()
+
+
+def flush_sync_logs():
+    """
+    Background job: move staged Sync Logs to the Sync Log table in multi-row inserts.
+
+    Each batch is inserted and removed from the staging table in the same
+    transaction, so a flush that dies halfway leaves its batch staged for the
+    next one. Rows that were inserted before are skipped by name.
+    """
+    cache = frappe.cache()
+    if not cache.set(_key(FLUSH_LOCK_KEY), 1, nx=True, ex=FLUSH_LOCK_TIMEOUT):
+        return
+
+    try:
+        cache.delete(_key(PENDING_COUNT_KEY))
+        flush_size = get_buffer_config()[1]
+
+        while True:
+            # Names are time-ordered, so the oldest logs go first
+            batch = frappe.get_all(
+                BUFFER_DOCTYPE,
+                fields=["name", "row_data"],
+                order_by="name asc",
+                limit=flush_size
+            )
+            if not batch:
+                break
+            _write_batch(batch)
+            if len(batch) < flush_size:
+                break
+
+        cache.set(_key(LAST_FLUSH_KEY), time.time())
+    finally:
+        cache.delete(_key(FLUSH_LOCK_KEY))
+
+
+def _write_batch(batch):
+    """Insert one staged batch into Sync Log, remove it from the buffer and commit"""
+    rows = [json.loads(item.row_data) for item in batch]
+
+    try:
+        insert_sync_log_rows(rows)
+        frappe.db.delete(BUFFER_DOCTYPE, {"name": ["in", [item.name for item in batch]]})
+        frappe.db.commit()
+    except Exception:
+        frappe.db.rollback()
+
+        # Fall back to one row at a time so a single bad row does not block the buffer
+        for item, row in zip(batch, rows):
+            try:
+                insert_sync_log_rows([row])
+                frappe.db.delete(BUFFER_DOCTYPE, item.name)
+                frappe.db.commit()
+            except Exception as e:
+                frappe.db.rollback()
+                frappe.log_error(f"Dropped buffered Sync Log {item.name}: {e}", "Sync Log Creation Error")
+                frappe.db.delete(BUFFER_DOCTYPE, item.name)
+                frappe.db.commit()
@@ -0,0 +1,125 @@
+import gzip
+import json
+import os
+
+import frappe
+from frappe.utils import add_days, cint, get_datetime, now_datetime
+
+from migration_portal.migration_portal.utils.payload_codec import decode_row
+
+# Rows archived and deleted per transaction
+RETENTION_BATCH_SIZE = 1000
+
+# Upper bound on batches per status per run, so one run cannot hold the worker for hours
+MAX_BATCHES_PER_RUN = 200
+
+# Archive location, relative to the site's private files
+ARCHIVE_FOLDER = "sync_log_archive"
+
+
+def get_retention_config(settings=None):
+    """
+    Read the Sync Log retention settings.
+
+    Returns:
+        tuple: (success_days, error_days, archive) where 0 days keeps rows forever.
+    """
+    if not settings:
+        settings = frappe.get_cached_doc("FlyOut Account Settings")
+
+    def days(fieldname, default):
+        value = settings.get(fieldname)
+        return default if value is None else max(cint(value), 0)
+
+    return (
+        days("sync_log_success_retention", 7),
+        days("sync_log_error_retention", 90),
+        bool(cint(settings.get("archive_sync_logs")))
+    )
+
+
+def run_sync_log_retention():
+    """
+    Scheduler entry point (daily): archive and delete Sync Logs past their retention.
+
+    Success logs and every other status (errors, partial successes) have
+    separate retention periods. Logs with a retry still scheduled are kept
+    until the retry has run.
+    """
+    success_days, error_days, archive = get_retention_config()
+
+    purged = {}
+    if success_days:
+        purged["Success"] = purge_sync_logs({"status": "Success"}, success_days, archive)
+    if error_days:
+        purged["Other"] = purge_sync_logs({"status": ["!=", "Success"]}, error_days, archive)
+
+    return purged
+
+
+def purge_sync_logs(filters, days, archive=False, batch_size=RETENTION_BATCH_SIZE):
+    """
+    Delete Sync Logs matching `filters` older than `days`, oldest first, in bounded batches.
+
+    Each batch is appended to the archive (if enabled) before it is deleted and
+    is committed on its own, so an interrupted run loses nothing and the next
+    run continues where it stopped.
+
+    Args:
+        filters (dict): Extra filters, e.g. {"status": "Success"}.
+        days (int): Retention period in days.
+        archive (bool, optional): Write rows to gzipped JSONL files before deleting them.
+        batch_size (int, optional): Rows per transaction.
+
+    Returns:
+        int: Number of rows deleted.
+    """
+    cutoff = add_days(now_datetime(), -days)
+    filters = dict(filters, sync_datetime=["<", cutoff], retry_scheduled=0)
+    deleted = 0
+
+    for _ in range(MAX_BATCHES_PER_RUN):
+        rows = frappe.get_all(
+            "Sync Log",
+            filters=filters,
+            fields=["*"] if archive else ["name"],
+            order_by="sync_datetime asc",
+            limit=batch_size
+        )
+        if not rows:
+            break
+
+        if archive:
+            archive_rows(rows)
+
+        frappe.db.delete("Sync Log", {"name": ["in", [row.name for row in rows]]})
+        frappe.db.commit()
+        deleted += len(rows)
+
+        if len(rows) < batch_size:
+            break
+
+    return deleted
+
+
+def archive_rows(rows):
+    """
+    Append Sync Log rows to one gzipped JSONL file per day of `sync_datetime`.
+
+    Files live at private/sync_log_archive/<YYYY>/<MM>/sync-log-<YYYY-MM-DD>.jsonl.gz.
+    Each call appends a new gzip member, which standard tools (zcat, gzip.open)
+    read as one continuous file. Compressed payloads are written decoded.
+    """
+    by_day = {}
+    for row in rows:
+        day = get_datetime(row.sync_datetime).date()
+        by_day.setdefault(day, []).append(row)
+
+    for day, day_rows in by_day.items():
+        folder = frappe.get_site_path("private", ARCHIVE_FOLDER, f"{day:%Y}", f"{day:%m}")
+        os.makedirs(folder, exist_ok=True)
+
+        with gzip.open(os.path.join(folder, f"sync-log-{day:%Y-%m-%d}.jsonl.gz"), "at", encoding="utf-8") as f:
+            for row in day_rows:
+                f.write(json.dumps(decode_row(row, pretty=False), default=str, separators=(",", ":")))
+                f.write("\n")
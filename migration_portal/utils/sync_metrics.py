@@ -0,0 +1,222 @@
+import functools
+import re
+import time
+from urllib.parse import urlparse
+
+import frappe
+
+from migration_portal.migration_portal.utils import circuit_breaker, rate_limiter
+from migration_portal.migration_portal.utils.sync_log_buffer import get_buffer_depth
+
+# Redis hashes (site-prefixed through frappe.cache().make_key)
+COUNTERS_KEY = "flyout_metrics_counters"
+HISTOGRAMS_KEY = "flyout_metrics_histograms"
+
+# Latency histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Path segments containing a digit are IDs (e.g. /providers/inquiries/FL-12345)
+ID_SEGMENT = re.compile(r"/[^/]*\d[^/]*")
+
+
+def _key(key):
+    return frappe.cache().make_key(key)
+
+
+def _field(name, labels):
+    return name + "|" + ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
+
+
+def _parse_field(field):
+    name, _, labels = field.partition("|")
+    return name, dict(label.split("=", 1) for label in labels.split(",") if label)
+
+
+def _hgetall(key):
+    # RedisWrapper.hgetall prefixes the key again and unpickles values; these are plain numbers
+    return frappe.cache().execute_command("HGETALL", _key(key)) or {}
+
+
+def incr(name, amount=1, **labels):
+    """Increment a counter. Metrics never raise into the sync path."""
+    try:
+        frappe.cache().hincrby(_key(COUNTERS_KEY), _field(name, labels), amount)
+    except Exception:
+        pass
+
+
+def observe(operation, seconds, outcome):
+    """
+    Record one timed operation: its latency histogram and its outcome counter.
+
+    Buckets are cumulative (Prometheus `le` semantics) and written in a single
+    Redis round trip.
+    """
+    try:
+        pipe = frappe.cache().pipeline()
+        histograms = _key(HISTOGRAMS_KEY)
+        for bound in LATENCY_BUCKETS:
+            if seconds <= bound:
+                pipe.hincrby(histograms, _field("bucket", {"operation": operation, "le": bound}), 1)
+        pipe.hincrby(histograms, _field("bucket", {"operation": operation, "le": "+Inf"}), 1)
+        pipe.hincrbyfloat(histograms, _field("sum", {"operation": operation}), seconds)
+        pipe.hincrby(histograms, _field("count", {"operation": operation}), 1)
+        pipe.hincrby(_key(COUNTERS_KEY), _field("operations_total", {"operation": operation, "outcome": outcome}), 1)
+        pipe.execute()
+    except Exception:
+        pass
+
+
+def get_outcome(result):
+    """Classify what a sync function returned: success, error, deferred, duplicate or stale"""
+    if isinstance(result, dict):
+        for flag in ("duplicate", "stale", "queued"):
+            if result.get(flag):
+                return "deferred" if flag == "queued" else flag
+        if result.get("success") is False:
+            return "error"
+    return "success"
+
+
+def get_error_outcome(exc):
+    """Classify a failed FlyOut HTTP call"""
+    if isinstance(exc, circuit_breaker.CircuitOpenError):
+        return "circuit_open"
+    if isinstance(exc, rate_limiter.RateLimitedError):
+        return "rate_limited"
+    response = getattr(exc, "response", None)
+    if response is not None:
+        return f"http_{response.status_code // 100}xx"
+    return "error"
+
+
+def endpoint_label(method, url):
+    """Low-cardinality label for a FlyOut URL, e.g. "PUT /providers/inquiries/{id}" """
+    return f"{method.upper()} {ID_SEGMENT.sub('/{id}', urlparse(url).path)}"
+
+
+def timed(operation):
+    """Decorator: record latency and outcome of every call as `operation`"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.monotonic()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception:
+                observe(operation, time.monotonic() - start, "error")
+                raise
+            observe(operation, time.monotonic() - start, get_outcome(result))
+            return result
+        return wrapper
+    return decorator
+
+
+def get_gauges():
+    """Current queue depths and breaker state, read at scrape time"""
+    state = circuit_breaker.get_state()
+    return {
+        "outbound_queue_pending": frappe.db.count("FlyOut Sync Queue", {"status": "Pending"}),
+        "outbound_queue_processing": frappe.db.count("FlyOut Sync Queue", {"status": "Processing"}),
+        "retry_queue_depth": frappe.db.count("FlyOut Retry Queue"),
+        "webhook_inbox_pending": frappe.db.count("FlyOut Webhook Inbox", {"status": "Pending"}),
+        "sync_log_buffer_depth": get_buffer_depth(),
+        "circuit_state": {"closed": 0, "half-open": 1, "open": 2}[state],
+        "rate_limit_blocked_seconds": round(rate_limiter.get_blocked_for(), 3)
+    }
+
+
+def get_counters():
+    """Return {(name, labels tuple): value} for all counters"""
+    raw = _hgetall(COUNTERS_KEY)
+    counters = {}
+    for field, value in raw.items():
+        name, labels = _parse_field(frappe.safe_decode(field))
+        counters[(name, tuple(sorted(labels.items())))] = int(value)
+    return counters
+
+
+def get_histograms():
+    """Return {operation: {"buckets": {le: count}, "sum": float, "count": int}}"""
+    raw = _hgetall(HISTOGRAMS_KEY)
+    histograms = {}
+    for field, value in raw.items():
+        kind, labels = _parse_field(frappe.safe_decode(field))
+        entry = histograms.setdefault(labels["operation"], {"buckets": {}, "sum": 0.0, "count": 0})
+        if kind == "bucket":
+            entry["buckets"][labels["le"]] = int(value)
+        elif kind == "sum":
+            entry["sum"] = float(value)
+        else:
+            entry["count"] = int(value)
+    return histograms
+
+
+def render_prometheus():
+    """Render every metric in the Prometheus text exposition format (version 0.0.4)"""
+    def labels_text(labels):
+        return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}" if labels else ""
+
+    lines = []
+
+    counters = get_counters()
+    for name in sorted({name for name, _ in counters}):
+        lines.append(f"# TYPE flyout_{name} counter")
+        for (counter, labels), value in sorted(counters.items()):
+            if counter == name:
+                lines.append(f"flyout_{name}{labels_text(labels)} {value}")
+
+    lines.append("# TYPE flyout_operation_duration_seconds histogram")
+    for operation, data in sorted(get_histograms().items()):
+        for bound in [str(b) for b in LATENCY_BUCKETS] + ["+Inf"]:
+            count = data["buckets"].get(bound, 0)
+            lines.append(f'flyout_operation_duration_seconds_bucket{{operation="{operation}",le="{bound}"}} {count}')
+        lines.append(f'flyout_operation_duration_seconds_sum{{operation="{operation}"}} {data["sum"]}')
+        lines.append(f'flyout_operation_duration_seconds_count{{operation="{operation}"}} {data["count"]}')
+
+    for name, value in get_gauges().items():
+        lines.append(f"# TYPE flyout_{name} gauge")
+        lines.append(f"flyout_{name} {value}")
+
+    return "\n".join(lines) + "\n"
+
+
+def get_summary():
+    """Metrics as plain data for the desk dashboard, with approximate latency percentiles"""
+    operations = []
+    for operation, data in sorted(get_histograms().items()):
+        operations.append({
+            "operation": operation,
+            "count": data["count"],
+            "avg": data["sum"] / data["count"] if data["count"] else 0,
+            "p50": _percentile(data, 0.5),
+            "p95": _percentile(data, 0.95),
+            "p99": _percentile(data, 0.99)
+        })
+
+    outcomes = {}
+    totals = {"retries_scheduled_total": 0, "dead_lettered_total": 0}
+    for (name, labels), value in get_counters().items():
+        if name == "operations_total":
+            labels = dict(labels)
+            outcomes.setdefault(labels["operation"], {})[labels["outcome"]] = value
+        elif name in totals:
+            totals[name] += value
+    for row in operations:
+        row["outcomes"] = outcomes.get(row["operation"], {})
+
+    return {"operations": operations, "gauges": get_gauges(), "totals": totals}
+
+
+def _percentile(data, q):
+    """Upper bound of the bucket holding the q-th quantile (None if it is above the largest bucket)"""
+    target = data["count"] * q
+    for bound in LATENCY_BUCKETS:
+        if data["buckets"].get(str(bound), 0) >= target:
+            return bound
+    return None
+
+
+def reset_metrics():
+    """Clear all counters and histograms"""
+    frappe.cache().delete(_key(COUNTERS_KEY), _key(HISTOGRAMS_KEY))
@@ -0,0 +1,303 @@
+import frappe
+from frappe.utils import now_datetime, add_to_date, cint
+
+from migration_portal.migration_portal.utils import circuit_breaker, rate_limiter
+
+# Background queue the drain worker runs on. Point a dedicated bench worker at it
+# (see `workers` in common_site_config.json) to isolate FlyOut traffic completely.
+SYNC_WORKER_QUEUE = "long"
+
+# Number of queue entries claimed per transaction by the drain worker
+DRAIN_BATCH_SIZE = 100
+
+# Entries stuck in "Processing" longer than this (minutes) are assumed orphaned by a dead worker
+STALE_PROCESSING_MINUTES = 30
+
+
+def is_queued_mode(settings=None):
+    """Return True if outbound pushes should go through the sync queue instead of the save path"""
+    if not settings:
+        settings = frappe.get_cached_doc("FlyOut Account Settings")
+    return (settings.outbound_sync_mode or "Queued") == "Queued"
+
+
+def is_realtime_sync(settings=None):
+    """Return True if documents are pushed as they change (Sync Frequency = Real-time)"""
+    if not settings:
+        settings = frappe.get_cached_doc("FlyOut Account Settings")
+    return (settings.sync_frequency or "Real-time") == "Real-time"
+
+
+def get_debounce_seconds(settings=None):
+    """Return the configured debounce window for outbound pushes, in seconds"""
+    if not settings:
+        settings = frappe.get_cached_doc("FlyOut Account Settings")
+    return max(cint(settings.sync_debounce_seconds), 0)
+
+
+def request_outbound_sync(doctype, docname, changed_fields=None, settings=None, doc=None):
+    """
+    Push a changed document to FlyOut the way a save does.
+
+    Nothing is sent unless sync is enabled and Sync Frequency is Real-time
+    (otherwise the scheduled batch sync picks the change up). In Queued mode a
+    pending push is recorded for the drain worker, otherwise the document is
+    pushed right away.
+
+    Args:
+        doctype (str): DocType name (must implement `sync_to_flyout`).
+        docname (str): Document name.
+        changed_fields (list, optional): Fields that changed; None means the full document.
+        settings (Document, optional): FlyOut Account Settings document.
+        doc (Document, optional): The document, if already loaded (Immediate mode).
+    """
+    if not settings:
+        settings = frappe.get_cached_doc("FlyOut Account Settings")
+    if not settings.enable_sync:
+        return
+
+    # Hourly/Daily/Weekly: picked up by the scheduled batch sync instead
+    if not is_realtime_sync(settings):
+        return
+
+    if is_queued_mode(settings):
+        # Only record the pending push; a background worker talks to FlyOut
+        enqueue_outbound_sync(doctype, docname, settings, changed_fields=changed_fields)
+    else:
+        (doc or frappe.get_doc(doctype, docname)).sync_to_flyout(changed_fields=changed_fields)
+
+
+def enqueue_outbound_sync(doctype, docname, settings=None, changed_fields=None, delay=None):
+    """
+    Record a durable pending push for a document and wake the drain worker.
+
+    Pushes are coalesced per (doctype, docname): while a Pending entry exists
+    for the document, further saves only bump its change counter. The worker
+    reads the document when the debounce window closes, so only the latest
+    state is sent (last write wins). Changed fields are merged across the
+    coalesced saves so the push carries every field that changed.
+
+    The entry is part of the caller's transaction, so it only becomes visible
+    (and the worker only starts) once the document save commits.
+
+    Args:
+        doctype (str): DocType name (must implement `sync_to_flyout`).
+        docname (str): Document name.
+        settings (Document, optional): FlyOut Account Settings document.
+        changed_fields (list, optional): Fields changed by this save; None means the full document.
+        delay (float, optional): Hold the push back at least this many seconds (e.g. Retry-After).
+
+    Returns:
+        str: Name of the FlyOut Sync Queue entry.
+    """
+    pending = frappe.db.get_value(
+        "FlyOut Sync Queue",
+        {"reference_doctype": doctype, "reference_name": docname, "status": "Pending"},
+        ["name", "change_count", "changed_fields"],
+        as_dict=True
+    )
+    if pending:
+        # Fold this change into the pending push; the window is not extended
+        # so a document that keeps changing is still sent regularly
+        merged = None
+        if changed_fields is not None and pending.changed_fields:
+            merged = sorted(set(parse_changed_fields(pending.changed_fields)) | set(changed_fields))
+
+        frappe.db.set_value(
+            "FlyOut Sync Queue", pending.name,
+            {
+                "change_count": cint(pending.change_count) + 1,
+                "changed_fields": "\n".join(merged) if merged else None
+            },
+            update_modified=False
+        )
+        return pending.name
+
+    debounce = max(get_debounce_seconds(settings), cint(delay))
+    now = now_datetime()
+
+    entry = frappe.get_doc({
+        "doctype": "FlyOut Sync Queue",
+        "reference_doctype": doctype,
+        "reference_name": docname,
+        "status": "Pending",
+        "queued_at": now,
+        "not_before": add_to_date(now, seconds=debounce),
+        "change_count": 1,
+        "changed_fields": "\n".join(changed_fields) if changed_fields else None
+    })
+    entry.insert(ignore_permissions=True)
+
+    # Debounced entries are picked up by the per-minute scheduler once due
+    if not debounce:
+        wake_outbound_worker()
+
+    return entry.name
+
+
+def parse_changed_fields(value):
+    """Return the changed fields stored on a queue entry, or None for a full push"""
+    if not value:
+        return None
+    return [f for f in value.splitlines() if f]
+
+
+def wake_outbound_worker():
+    """Enqueue the drain job once the current transaction commits (no-op if one is already queued)"""
+    frappe.enqueue(
+        "migration_portal.migration_portal.utils.sync_queue.process_outbound_queue",
+        queue=SYNC_WORKER_QUEUE,
+        job_id=f"flyout_outbound_drain::{frappe.local.site}",
+        deduplicate=True,
+        enqueue_after_commit=True
+    )
+
+
+def run_outbound_queue():
+    """
+    Scheduler entry point: release entries orphaned by a crashed worker and
+    start the drain worker for entries that are due.
+
+    Nothing is pushed from here: the scheduler job runs on the default queue,
+    FlyOut traffic stays on SYNC_WORKER_QUEUE through the deduplicated drain job.
+    """
+    requeue_stale_entries()
+    if frappe.db.exists("FlyOut Sync Queue", {"status": "Pending", "not_before": ["<=", now_datetime()]}):
+        wake_outbound_worker()
+
+
+def process_outbound_queue(batch_size=DRAIN_BATCH_SIZE):
+    """
+    Background job: drain due FlyOut pushes in batches.
+
+    Args:
+        batch_size (int, optional): Number of entries claimed per transaction.
+    """
+    while True:
+        # Leave entries pending while FlyOut is down or throttling us
+        if circuit_breaker.is_open() or rate_limiter.is_blocked():
+            break
+
+        entries = claim_pending_entries(batch_size)
+        if not entries:
+            break
+
+        # Entries for the same document that slipped past coalescing (concurrent
+        # saves) are sent once and share the outcome
+        grouped = {}
+        for entry in entries:
+            grouped.setdefault((entry.reference_doctype, entry.reference_name), []).append(entry)
+
+        for group in grouped.values():
+            entry = group[0]
+            if len(group) > 1:
+                # A full push in the group wins, otherwise send every field any of them changed
+                fields = [parse_changed_fields(e.changed_fields) for e in group]
+                if any(f is None for f in fields):
+                    entry.changed_fields = None
+                else:
+                    entry.changed_fields = "\n".join(sorted({f for fs in fields for f in fs}))
+
+            process_entry(entry, duplicates=[e.name for e in group[1:]])
+
+        if len(entries) < batch_size:
+            break
+
+
+def claim_pending_entries(batch_size):
+    """Lock a batch of due pending entries, mark them as Processing and commit"""
+    entries = frappe.get_all(
+        "FlyOut Sync Queue",
+        filters={"status": "Pending", "not_before": ["<=", now_datetime()]},
+        fields=["name", "reference_doctype", "reference_name", "attempts", "changed_fields"],
+        order_by="not_before asc",
+        limit=batch_size,
+        for_update=True
+    )
+
+    if entries:
+        frappe.db.set_value(
+            "FlyOut Sync Queue",
+            {"name": ["in", [e.name for e in entries]]},
+            "status",
+            "Processing"
+        )
+    frappe.db.commit()
+
+    return entries
+
+
+def process_entry(entry, duplicates=None):
+    """
+    Push a single queued document to FlyOut and record the outcome on the entry.
+
+    Failed pushes are logged and retried by sync_utils as usual; the entry only
+    records whether this attempt succeeded.
+
+    Args:
+        entry (dict): Claimed queue entry.
+        duplicates (list, optional): Other claimed entries for the same document.
+    """
+    status = "Completed"
+    error_message = None
+
+    try:
+        doc = frappe.get_doc(entry.reference_doctype, entry.reference_name)
+        result = doc.sync_to_flyout(changed_fields=parse_changed_fields(entry.changed_fields))
+
+        if result and result.get("queued"):
+            # Deferred into a new pending entry while the circuit is open
+            error_message = result.get("message")
+        elif result and not result.get("success"):
+            status = "Failed"
+            error_message = result.get("message")
+    except frappe.DoesNotExistError:
+        # Document was deleted after being queued, nothing left to push
+        frappe.db.rollback()
+        status = "Failed"
+        error_message = f"{entry.reference_doctype} {entry.reference_name} no longer exists"
+    except Exception as e:
+        frappe.db.rollback()
+        frappe.log_error(
+            f"Outbound sync failed for {entry.reference_doctype} {entry.reference_name}: {e}\n{frappe.get_traceback()}",
+            "FlyOut Sync Queue Error"
+        )
+        status = "Failed"
+        error_message = str(e)
+
+    if status == "Completed" and not error_message:
+        # A replayed dead letter went through
+        frappe.db.set_value(
+            "FlyOut Dead Letter",
+            {
+                "reference_doctype": entry.reference_doctype,
+                "reference_name": entry.reference_name,
+                "status": "Replay Queued"
+            },
+            "status",
+            "Resolved"
+        )
+
+    frappe.db.set_value(
+        "FlyOut Sync Queue",
+        {"name": ["in", [entry.name] + (duplicates or [])]},
+        {
+            "status": status,
+            "processed_at": now_datetime(),
+            "attempts": (entry.attempts or 0) + 1,
+            "error_message": error_message
+        }
+    )
+    frappe.db.commit()
+
+
+def requeue_stale_entries():
+    """Put entries left in Processing by a dead worker back to Pending"""
+    cutoff = add_to_date(now_datetime(), minutes=-STALE_PROCESSING_MINUTES)
+    frappe.db.set_value(
+        "FlyOut Sync Queue",
+        {"status": "Processing", "modified": ["<", cutoff]},
+        "status",
+        "Pending"
+    )
+    frappe.db.commit()
@@ -1,10 +1,86 @@
 import frappe
 import requests
-import json
-from frappe.utils import now_datetime, get_datetime
+from frappe.utils import now_datetime, get_datetime, cint, flt, add_to_date
+import random
 import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-def push_inquiry_updates(inquiry_doc, settings=None):
+from migration_portal.migration_portal.api.flyout import create_sync_log
+from migration_portal.migration_portal.utils import circuit_breaker
+from migration_portal.migration_portal.utils import rate_limiter
+from migration_portal.migration_portal.utils import sync_metrics
+from migration_portal.migration_portal.utils.circuit_breaker import CircuitOpenError
+from migration_portal.migration_portal.utils.rate_limiter import RateLimitedError
+from migration_portal.migration_portal.utils.sync_queue import enqueue_outbound_sync, is_realtime_sync
+from migration_portal.migration_portal.utils.dead_letter import record_dead_letter
+
+# Local Inquiry field -> FlyOut payload key
+# This mapping depends on FlyOut's expected API structure
+INQUIRY_FIELD_MAP = {
+    "applicant_name": "applicant_name",
+    "contact_email": "email",
+    "contact_phone": "phone",
+    "service_type": "service_type",
+    "destination_country": "destination_country",
+    "status": "status", # Map local status to FlyOut status if necessary
+    "notes": "notes"
+}
+
+# Local Client field -> FlyOut payload key
+CLIENT_FIELD_MAP = {
+    "client_name": "applicant_name",
+    "email": "email",
+    "phone": "phone",
+    "status": "status" # Sent as the mapped FlyOut status, see Client.get_flyout_status
+}
+
+
+def get_changed_sync_fields(doc, field_map):
+    """
+    Return the FlyOut-mapped fields of `doc` that changed in the current save.
+
+    Compares against the document's previous version (`get_doc_before_save`).
+    New documents report every mapped field. A docstatus change (submit/cancel)
+    counts as a status change.
+
+    Args:
+        doc (Document): Document being saved.
+        field_map (dict): Local fieldname -> FlyOut key (e.g. INQUIRY_FIELD_MAP).
+
+    Returns:
+        list: Changed local fieldnames (empty if nothing FlyOut cares about changed).
+    """
+    before = doc.get_doc_before_save()
+    if not before:
+        return list(field_map)
+
+    changed = [f for f in field_map if doc.get(f) != before.get(f)]
+
+    if "status" in field_map and "status" not in changed and doc.docstatus != before.docstatus:
+        changed.append("status")
+
+    return changed
+
+
+def build_sync_payload(values, field_map, changed_fields=None):
+    """
+    Map local field values to a FlyOut payload, limited to `changed_fields`.
+
+    Args:
+        values (dict): Local fieldname -> value.
+        field_map (dict): Local fieldname -> FlyOut key.
+        changed_fields (list, optional): Fields to include; all mapped fields if None.
+
+    Returns:
+        dict: FlyOut payload (without identifiers/timestamps).
+    """
+    fields = field_map if changed_fields is None else [f for f in field_map if f in changed_fields]
+    return {field_map[f]: values.get(f) for f in fields}
+
+
+@sync_metrics.timed("push_inquiry")
+def push_inquiry_updates(inquiry_doc, settings=None, changed_fields=None, schedule_retry=True):
     """
     Push inquiry updates to FlyOut.
     Called from Inquiry hooks (e.g., on_update).
@@ -12,6 +88,8 @@ def push_inquiry_updates(inquiry_doc, settings=None):
     Args:
         inquiry_doc (Document): The Inquiry document being updated.
         settings (Document, optional): FlyOut Account Settings document.
+        changed_fields (list, optional): Local fields to send; the full mapped field set if None.
+        schedule_retry (bool, optional): Schedule a retry on failure (False when called by retry_sync).
     
     Returns:
         dict: Result with success status and message.
@@ -19,6 +97,9 @@ def push_inquiry_updates(inquiry_doc, settings=None):
     if frappe.flags.in_sync: # Prevent sync loop
         return {"success": False, "message": "Sync currently in progress, skipping outbound."}
 
+    if changed_fields is not None and not any(f in INQUIRY_FIELD_MAP for f in changed_fields):
+        return {"success": True, "skipped": True, "message": "No FlyOut fields changed, nothing to sync."}
+
     if not settings:
         settings = frappe.get_cached_doc("FlyOut Account Settings")
     
@@ -29,23 +110,17 @@ def push_inquiry_updates(inquiry_doc, settings=None):
         frappe.log_error(f"Cannot sync Inquiry {inquiry_doc.name}: Missing FlyOut Inquiry ID.", "FlyOut Sync Error")
         return {"success": False, "message": "Missing FlyOut Inquiry ID"}
 
+    # Fail fast while FlyOut is down or asked us to back off; the outbound queue sends it later
+    if circuit_breaker.is_open() or rate_limiter.is_blocked():
+        return defer_push("Inquiry", inquiry_doc.name, changed_fields)
+
     # Construct the endpoint URL
     endpoint = f"{settings.flyout_base_url}/providers/inquiries/{inquiry_doc.flyout_inquiry_id}" # Assume PUT updates existing
     
-    # Prepare data payload (Map local fields to FlyOut fields)
-    # This mapping depends on FlyOut's expected API structure
-    payload = {
-        "inquiry_id": inquiry_doc.flyout_inquiry_id,
-        "applicant_name": inquiry_doc.applicant_name,
-        "email": inquiry_doc.contact_email,
-        "phone": inquiry_doc.contact_phone,
-        "service_type": inquiry_doc.service_type,
-        "destination_country": inquiry_doc.destination_country,
-        "status": inquiry_doc.status, # Map local status to FlyOut status if necessary
-        "notes": inquiry_doc.notes, # Send latest notes
-        "updated_at": now_datetime().isoformat()
-        # Add other fields FlyOut expects
-    }
+    # Prepare data payload (Map local fields to FlyOut fields), only the changed ones
+    payload = {"inquiry_id": inquiry_doc.flyout_inquiry_id}
+    payload.update(build_sync_payload(inquiry_doc.as_dict(), INQUIRY_FIELD_MAP, changed_fields))
+    payload["updated_at"] = now_datetime().isoformat()
 
     # Set up headers
     headers = {
@@ -53,23 +128,21 @@ def push_inquiry_updates(inquiry_doc, settings=None):
         "Authorization": f"Bearer {settings.get_password('api_key')}"
     }
     
-    request_data_str = json.dumps(payload, indent=2)
     sync_log_name = None
     try:
         # Make the API call with retry logic
-        response = make_api_request("PUT", endpoint, headers, payload, max_retries=3)
+        response = make_api_request("PUT", endpoint, headers, payload)
         response_data = response.json() if response.text else {}
         
         # Create success sync log
         sync_log_name = create_sync_log(
             "Outbound", "Success", "Inquiry", inquiry_doc.name, 
-            inquiry_doc.flyout_inquiry_id, request_data_str, response_data, 
+            inquiry_doc.flyout_inquiry_id, payload, response_data, 
             endpoint=endpoint, method="PUT"
         )
 
         # Update last sync datetime in settings
-        frappe.db.set_value("FlyOut Account Settings", settings.name, "last_sync_datetime", now_datetime())
-        frappe.db.set_value("FlyOut Account Settings", settings.name, "sync_status", "Active")
+        mark_synced(settings)
         
         return {
             "success": True,
@@ -77,20 +150,97 @@ def push_inquiry_updates(inquiry_doc, settings=None):
             "endpoint": endpoint,
             "response": response_data
         }
+    except (CircuitOpenError, RateLimitedError) as e:
+        # Circuit open (or lost the half-open probe) / rate limited: nothing was sent
+        return defer_push("Inquiry", inquiry_doc.name, changed_fields, delay=getattr(e, "retry_after", None))
     except Exception as e:
         # Create error sync log
         sync_log_name = create_sync_log(
             "Outbound", "Error", "Inquiry", inquiry_doc.name, 
-            inquiry_doc.flyout_inquiry_id, request_data_str, None, 
+            inquiry_doc.flyout_inquiry_id, payload, None, 
             error_message=str(e), endpoint=endpoint, method="PUT"
         )
 
         # Update sync status to error in settings
-        frappe.db.set_value("FlyOut Account Settings", settings.name, "sync_status", "Error")
+        update_sync_status(settings, "Error")
         
-        # Schedule retry if applicable
-        schedule_sync("Inquiry", inquiry_doc.name, sync_log=sync_log_name)
+        # Schedule retry if applicable (retries reschedule their own Sync Log)
+        if schedule_retry:
+            schedule_sync("Inquiry", inquiry_doc.name, sync_log=sync_log_name)
+
+        return {
+            "success": False,
+            "message": str(e),
+            "error_type": type(e).__name__,
+            "endpoint": endpoint
+        }
+
+@sync_metrics.timed("push_client")
+def push_client_updates(data, settings=None, client_name=None):
+    """
+    Push client updates to FlyOut.
+    Called from Client.sync_client_to_flyout.
+
+    Args:
+        data (dict): Payload to send, identified by the original FlyOut inquiry_id.
+        settings (Document, optional): FlyOut Account Settings document.
+        client_name (str, optional): Client the update belongs to (for the Sync Log).
+
+    Returns:
+        dict: Result with success status and message.
+    """
+    if frappe.flags.in_sync: # Prevent sync loop
+        return {"success": False, "message": "Sync currently in progress, skipping outbound."}
 
+    if not settings:
+        settings = frappe.get_cached_doc("FlyOut Account Settings")
+
+    if not settings.enable_sync:
+        return {"success": False, "message": "Synchronization is disabled"}
+
+    # Fail fast while FlyOut is down or asked us to back off; the outbound queue sends it later
+    if client_name and (circuit_breaker.is_open() or rate_limiter.is_blocked()):
+        return defer_push("Client", client_name)
+
+    endpoint = f"{settings.flyout_base_url}/providers/inquiries/{data['inquiry_id']}"
+
+    headers = {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {settings.get_password('api_key')}"
+    }
+
+    try:
+        response = make_api_request("PUT", endpoint, headers, data)
+        response_data = response.json() if response.text else {}
+
+        create_sync_log(
+            "Outbound", "Success", "Client", client_name,
+            data["inquiry_id"], data, response_data,
+            endpoint=endpoint, method="PUT"
+        )
+
+        mark_synced(settings)
+
+        return {
+            "success": True,
+            "message": "Data synced successfully",
+            "endpoint": endpoint,
+            "response": response_data
+        }
+    except (CircuitOpenError, RateLimitedError) as e:
+        if client_name:
+            return defer_push("Client", client_name, delay=getattr(e, "retry_after", None))
+        return {"success": False, "message": str(e), "error_type": type(e).__name__, "endpoint": endpoint}
+    except Exception as e:
+        create_sync_log(
+            "Outbound", "Error", "Client", client_name,
+            data["inquiry_id"], data, None,
+            error_message=str(e), endpoint=endpoint, method="PUT"
+        )
+
+        update_sync_status(settings, "Error")
+
+        # Retry scheduling is left to the caller (Client.sync_client_to_flyout)
         return {
             "success": False,
             "message": str(e),
@@ -98,76 +248,264 @@ def push_inquiry_updates(inquiry_doc, settings=None):
             "endpoint": endpoint
         }
 
-def make_api_request(method, url, headers, data=None, max_retries=3, retry_delay=2):
+def defer_push(doctype, docname, changed_fields=None, delay=None):
+    """
+    Park a push in the outbound queue while FlyOut cannot be called
+    (circuit open, or rate limited / Retry-After in effect).
+
+    No HTTP call, Sync Log or settings write happens; the queue worker sends
+    the document once FlyOut accepts requests again.
+
+    Args:
+        delay (float, optional): Seconds to hold the push back at least.
+    """
+    enqueue_outbound_sync(doctype, docname, changed_fields=changed_fields, delay=delay)
+    return {
+        "success": False,
+        "queued": True,
+        "message": "FlyOut is unavailable or rate limited, push queued"
+    }
+
+
+def mark_synced(settings):
+    """
+    Record a successful push on FlyOut Account Settings.
+
+    In Hourly/Daily/Weekly mode last_sync_datetime is the batch sync's
+    high-watermark (see batch_sync), so individual pushes leave it alone.
+    """
+    if is_realtime_sync(settings):
+        frappe.db.set_value("FlyOut Account Settings", settings.name, "last_sync_datetime", now_datetime())
+    update_sync_status(settings, "Active")
+
+
+def update_sync_status(settings, status):
+    """Set FlyOut Account Settings.sync_status, skipping the write if it is already set"""
+    if settings.sync_status != status:
+        frappe.db.set_value("FlyOut Account Settings", settings.name, "sync_status", status)
+        settings.sync_status = status
+
+
+# Methods urllib3 may retry at the transport level (safe to send twice)
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "PUT", "DELETE", "OPTIONS"])
+
+# Pooled sessions of this worker process, keyed by connection settings
+_http_sessions = {}
+
+
+def get_http_config(settings=None):
+    """
+    Read the HTTP connection settings for FlyOut traffic.
+
+    Returns:
+        tuple: (pool_size, keep_alive, transport_retries, connect_timeout, read_timeout)
+    """
+    if not settings:
+        settings = frappe.get_cached_doc("FlyOut Account Settings")
+
+    return (
+        cint(settings.get("http_pool_size")) or 10,
+        bool(cint(settings.get("http_keep_alive", 1))),
+        max(cint(settings.get("http_transport_retries", 2)), 0),
+        flt(settings.get("http_connect_timeout")) or 5,
+        flt(settings.get("http_read_timeout")) or 30
+    )
+
+
+def get_flyout_session(config=None):
+    """
+    Return this worker's pooled, keep-alive HTTP session for FlyOut.
+
+    Connections are reused across pushes, retries and connection tests, so
+    only the first call per connection pays the TCP/TLS handshake. A new
+    session is built when the connection settings change.
+
+    Args:
+        config (tuple, optional): Result of get_http_config().
+
+    Returns:
+        requests.Session: Shared session.
+    """
+    if config is None:
+        config = get_http_config()
+
+    session = _http_sessions.get(config)
+    if session is None:
+        pool_size, keep_alive, transport_retries = config[:3]
+
+        # Only fast failures are retried in place. Read timeouts (the worker already
+        # waited the full read timeout) and 503s (FlyOut asking us to back off) go
+        # back to make_api_request, the circuit breaker and the retry scheduler;
+        # Retry-After is never slept on inside the worker.
+        retry = Retry(
+            total=transport_retries,
+            connect=transport_retries,
+            read=0,
+            status=transport_retries,
+            backoff_factor=0.2,
+            status_forcelist=(502, 504),
+            allowed_methods=IDEMPOTENT_METHODS,
+            respect_retry_after_header=False,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not keep_alive:
+            session.headers["Connection"] = "close"
+
+        # Drop sessions built for outdated settings
+        for old_session in _http_sessions.values():
+            old_session.close()
+        _http_sessions.clear()
+        _http_sessions[config] = session
+
+    return session
+
+
+def make_api_request(method, url, headers, data=None, bypass_circuit=False):
     """
-    Make an API request with retry logic.
+    Make a single API request to FlyOut.
+
+    Transient connection errors are retried by the pooled session (see
+    get_flyout_session). Anything else fails immediately; callers persist the
+    failure and the retry dispatcher (dispatch_due_retries) tries again later,
+    so no worker ever sleeps waiting for FlyOut.
+
+    Every call goes through the shared circuit breaker: after repeated
+    failures requests fail fast with CircuitOpenError until a probe succeeds.
+    Calls are also throttled by the shared rate limiter; a 429 response makes
+    every worker honour FlyOut's Retry-After.
     
     Args:
         method (str): HTTP method (GET, POST, PUT, DELETE)
         url (str): API endpoint
         headers (dict): HTTP headers
         data (dict, optional): Data to send (will be JSON serialized for POST/PUT)
-        max_retries (int, optional): Maximum number of retries
-        retry_delay (int, optional): Delay between retries in seconds
+        bypass_circuit (bool, optional): Send even if the circuit is open (e.g. a manual connection test).
     
     Returns:
         requests.Response: HTTP response object
     
     Raises:
-        requests.exceptions.RequestException: If request fails after all retries.
+        requests.exceptions.RequestException: If the request fails.
+        CircuitOpenError: If the circuit is open.
+        RateLimitedError: If the rate limit does not allow a call soon enough.
     """
-    retry_count = 0
-    last_exception = None
-    
-    while retry_count < max_retries:
-        try:
-            request_kwargs = {
-                "headers": headers,
-                "timeout": 30 # Standard timeout
-            }
-            if data is not None and method.upper() in ["POST", "PUT"]:
-                 request_kwargs["json"] = data
-            elif data is not None and method.upper() == "GET": # Params for GET
-                 request_kwargs["params"] = data
-
-            response = requests.request(method, url, **request_kwargs)
-            
-            # Check if the response indicates failure
-            response.raise_for_status() # Raises HTTPError for 4xx/5xx
-            
-            return response # Return successful response
-
-        except requests.exceptions.RequestException as e:
-            last_exception = e
-            retry_count += 1
-            
-            # Log the retry attempt
-            frappe.log_error(
-                f"API request to {url} failed (attempt {retry_count}/{max_retries}): {str(e)}",
-                "FlyOut API Retry"
+    probe = False
+    if not bypass_circuit:
+        probe = circuit_breaker.before_request()
+
+    try:
+        slot = rate_limiter.acquire()
+    except Exception:
+        # A probe held back by the rate limiter must not keep the circuit from recovering
+        if probe:
+            circuit_breaker.release_probe()
+        raise
+
+    config = get_http_config()
+    session = get_flyout_session(config)
+
+    request_kwargs = {
+        "headers": headers,
+        "timeout": (config[3], config[4]) # (connect, read)
+    }
+    if data is not None and method.upper() in ["POST", "PUT"]:
+         request_kwargs["json"] = data
+    elif data is not None and method.upper() == "GET": # Params for GET
+         request_kwargs["params"] = data
+
+    start = time.monotonic()
+    outcome = "success"
+    try:
+        response = session.request(method, url, **request_kwargs)
+
+        if response.status_code == 429:
+            # FlyOut is throttling us: stop every worker for the requested time
+            retry_after = rate_limiter.parse_retry_after(response)
+            rate_limiter.block_for(retry_after)
+            raise RateLimitedError(
+                f"FlyOut rate limit exceeded (429), retry after {retry_after:.0f}s",
+                retry_after=retry_after, response=response
             )
-            
-            # Wait before retrying, unless it's the last attempt
-            if retry_count < max_retries:
-                time.sleep(retry_delay * (2 ** (retry_count - 1))) # Exponential backoff
-            
-    # If loop completes, all retries failed. Raise the last exception.
-    if last_exception:
-         raise last_exception
-    else:
-         # Should not happen if max_retries > 0, but handle defensively
-         raise requests.exceptions.RequestException("API request failed after retries, but no exception was captured.")
 
+        if response.status_code == 503 and response.headers.get("Retry-After"):
+            # Unavailable with a requested pause: honour it for every worker, not by sleeping here
+            rate_limiter.block_for(rate_limiter.parse_retry_after(response))
+        
+        # Check if the response indicates failure
+        response.raise_for_status() # Raises HTTPError for 4xx/5xx
+    except requests.exceptions.RequestException as e:
+        outcome = sync_metrics.get_error_outcome(e)
+
+        # 4xx responses still prove FlyOut is reachable
+        if circuit_breaker.is_failure(e):
+            circuit_breaker.record_failure()
+        else:
+            circuit_breaker.record_success()
+        raise
+    finally:
+        rate_limiter.release(slot)
+        sync_metrics.observe(sync_metrics.endpoint_label(method, url), time.monotonic() - start, outcome)
+
+    circuit_breaker.record_success()
+    
+    return response # Return successful response
+
+
+def get_retry_policy(settings=None):
+    """
+    Read the retry policy from FlyOut Account Settings.
+
+    Returns:
+        tuple: (max_attempts, base_delay_seconds, max_delay_seconds)
+    """
+    if not settings:
+        settings = frappe.get_cached_doc("FlyOut Account Settings")
+
+    return (
+        cint(settings.get("max_sync_retries") or 5),
+        cint(settings.get("retry_base_delay") or 60),
+        cint(settings.get("retry_max_delay") or 3600)
+    )
 
-def schedule_sync(doctype, docname, sync_log=None, retry_after=300):
+
+def compute_retry_delay(attempt, settings=None):
     """
-    Schedule a document for sync retry using Frappe's background jobs.
+    Exponential backoff with jitter for the given retry attempt.
+
+    The delay doubles with every attempt up to the configured maximum; a
+    random jitter in the upper half of the window spreads retries out so
+    documents that failed together do not all retry together.
+
+    Args:
+        attempt (int): Number of retries already made (0 for the first retry).
+
+    Returns:
+        int: Delay in seconds.
+    """
+    _max_attempts, base_delay, max_delay = get_retry_policy(settings)
+    delay = min(base_delay * (2 ** attempt), max_delay)
+    return int(random.uniform(delay / 2, delay))
+
+
+def schedule_sync(doctype, docname, sync_log=None, retry_after=None):
+    """
+    Schedule a document for sync retry.
+
+    Only records the next attempt time, on the Sync Log and in the narrow
+    FlyOut Retry Queue; the periodic dispatcher (dispatch_due_retries) picks
+    it up from the queue when due, so the calling worker is released
+    immediately.
     
     Args:
         doctype (str): DocType name
         docname (str): Document name
         sync_log (str, optional): The name of the failed Sync Log entry.
-        retry_after (int, optional): Retry after seconds.
+        retry_after (int, optional): Retry after seconds (defaults to backoff based on the log's retry count).
     """
     if not sync_log:
         # Optionally, find the latest failed sync log if not provided
@@ -189,69 +527,138 @@ def schedule_sync(doctype, docname, sync_log=None, retry_after=300):
         sync_log = latest_failed[0].name
 
     try:
+        retry_count = cint(frappe.db.get_value("Sync Log", sync_log, "retry_count"))
+        if retry_after is None:
+            retry_after = compute_retry_delay(retry_count)
+
+        next_retry_at = add_to_date(now_datetime(), seconds=retry_after)
+
         # Mark the specific sync log for retry
-        frappe.db.set_value("Sync Log", sync_log, "retry_scheduled", 1)
-        
-        # Enqueue the retry job
-        frappe.enqueue(
-            "migration_portal.migration_portal.utils.sync_utils.retry_sync",
-            queue="short", # Or choose appropriate queue
-            timeout=600,
-            doctype=doctype,
-            docname=docname,
-            sync_log_name=sync_log,
-            enqueue_after_commit=True,
-            # Frappe < v14 might use `run_at` instead of `enqueue_after`
-            # run_at = frappe.utils.add_to_date(None, seconds=retry_after)
-            # For Frappe v14+, enqueue_after expects seconds delay
-            enqueue_after=retry_after 
-        )
-        frappe.logger().info(f"Scheduled retry for {doctype} {docname} (Sync Log: {sync_log}) after {retry_after} seconds.")
+        frappe.db.set_value("Sync Log", sync_log, {
+            "retry_scheduled": 1,
+            "next_retry_at": next_retry_at
+        })
+
+        # The dispatcher reads due retries from the queue, never from the log
+        if frappe.db.exists("FlyOut Retry Queue", sync_log):
+            frappe.db.set_value("FlyOut Retry Queue", sync_log, {
+                "next_retry_at": next_retry_at,
+                "retry_count": retry_count
+            })
+        else:
+            frappe.get_doc({
+                "doctype": "FlyOut Retry Queue",
+                "sync_log": sync_log,
+                "reference_doctype": doctype,
+                "reference_name": docname,
+                "next_retry_at": next_retry_at,
+                "retry_count": retry_count
+            }).insert(ignore_permissions=True)
+        frappe.logger().info(f"Scheduled retry for {doctype} {docname} (Sync Log: {sync_log}) at {next_retry_at}.")
+        frappe.db.after_commit.add(lambda: sync_metrics.incr("retries_scheduled_total", doctype=doctype))
     except Exception as e:
          frappe.log_error(f"Failed to schedule sync retry for {doctype} {docname}: {e}", "Sync Retry Schedule Error")
-         # Optionally, unmark the sync log if enqueue fails
-         frappe.db.set_value("Sync Log", sync_log, "retry_scheduled", 0)
 
 
+def dispatch_due_retries(batch_size=100):
+    """
+    Scheduler entry point: run the retries that are due, in batches.
+
+    Due entries are claimed from FlyOut Retry Queue (removed, and the Sync
+    Log's retry_scheduled reset) and committed before any HTTP call, so
+    concurrent dispatchers never retry the same log twice.
+
+    Args:
+        batch_size (int, optional): Number of retries claimed per transaction.
+    """
+    while True:
+        # Leave retries parked while FlyOut is down or throttling us
+        if circuit_breaker.is_open() or rate_limiter.is_blocked():
+            break
+
+        due = frappe.get_all(
+            "FlyOut Retry Queue",
+            filters={"next_retry_at": ["<=", now_datetime()]},
+            fields=["name", "sync_log", "reference_doctype", "reference_name"],
+            order_by="next_retry_at asc",
+            limit=batch_size,
+            for_update=True
+        )
+        if not due:
+            break
+
+        frappe.db.delete("FlyOut Retry Queue", {"name": ["in", [d.name for d in due]]})
+        frappe.db.set_value("Sync Log", {"name": ["in", [d.sync_log for d in due]]}, "retry_scheduled", 0)
+        frappe.db.commit()
+
+        for entry in due:
+            retry_sync(entry.reference_doctype, entry.reference_name, entry.sync_log)
+            frappe.db.commit()
+
+        if len(due) < batch_size:
+            break
+
+
+@sync_metrics.timed("retry_sync")
 def retry_sync(doctype, docname, sync_log_name):
     """
-    Background job function to retry a failed sync operation.
+    Retry a failed sync operation (called by dispatch_due_retries).
+
+    On failure the same Sync Log is rescheduled with a longer backoff until
+    the configured maximum number of attempts is reached; the document then
+    goes to the dead-letter store (FlyOut Dead Letter) for a bulk replay.
     
     Args:
         doctype (str): DocType name.
         docname (str): Document name.
         sync_log_name (str): Sync Log document name that triggered the retry.
     """
+    max_attempts = get_retry_policy()[0]
+    retry_count = cint(frappe.db.get_value("Sync Log", sync_log_name, "retry_count")) + 1
+
+    # Increment retry count on the log
+    frappe.db.set_value("Sync Log", sync_log_name, {
+        "retry_count": retry_count,
+        "retry_scheduled": 0 # Mark as no longer scheduled for this attempt
+    })
+
+    error = None
+    error_type = None
     try:
         # Get the document
         doc = frappe.get_doc(doctype, docname)
         
-        # Get the sync log
-        log = frappe.get_doc("Sync Log", sync_log_name)
-        
-        # Increment retry count on the log
-        log.db_set("retry_count", log.retry_count + 1)
-        log.db_set("retry_scheduled", 0) # Mark as no longer scheduled for this attempt
-        # No need for log.save() when using db_set
-        
         # Call the appropriate sync method based on doctype
         # This needs to be implemented in the respective doctype controllers
         if hasattr(doc, 'sync_to_flyout') and callable(doc.sync_to_flyout):
-            frappe.logger().info(f"Retrying sync for {doctype} {docname} (Log: {sync_log_name})")
-            doc.sync_to_flyout(is_retry=True, originating_log=sync_log_name)
+            frappe.logger().info(f"Retrying sync for {doctype} {docname} (Log: {sync_log_name}, attempt {retry_count}/{max_attempts})")
+            result = doc.sync_to_flyout(is_retry=True, originating_log=sync_log_name)
             # The sync_to_flyout method should handle creating new success/error logs
+            if result and result.get("queued"):
+                # Circuit opened / rate limited meanwhile; the outbound queue owns this push now
+                return
+            if result and not result.get("success"):
+                error = result.get("message")
+                error_type = result.get("error_type")
         else:
              frappe.log_error(f"Cannot retry sync for {doctype} {docname}: No sync_to_flyout method found.", "Sync Retry Error")
-             # Update the original log to indicate permanent failure? Maybe not here.
+             return
 
+    except frappe.DoesNotExistError:
+        frappe.db.set_value("Sync Log", sync_log_name, "error_message", f"Retry abandoned: {doctype} {docname} no longer exists")
+        return
     except Exception as e:
         frappe.log_error(f"Error during sync retry for {doctype} {docname} (Log: {sync_log_name}): {e}", "Sync Retry Execution Error")
-        # Log the error in the original sync log? 
-        try:
-             log = frappe.get_doc("Sync Log", sync_log_name)
-             log.db_set("error_message", f"Retry failed: {str(e)}\n{frappe.get_traceback()}")
-             # Decide if we should reschedule again or mark as permanently failed after N retries
-        except Exception as log_e:
-             frappe.log_error(f"Failed to update sync log {sync_log_name} after retry error: {log_e}", "Sync Log Update Error")
-
-# Add other utility functions as needed, e.g., for communication 
\ No newline at end of file
+        error = f"{str(e)}\n{frappe.get_traceback()}"
+        error_type = type(e).__name__
+
+    if error is None:
+        return
+
+    if retry_count < max_attempts:
+        schedule_sync(doctype, docname, sync_log=sync_log_name, retry_after=compute_retry_delay(retry_count))
+    else:
+        frappe.db.set_value("Sync Log", sync_log_name, "error_message", f"Retry limit reached after {retry_count} attempts: {error}")
+        record_dead_letter(doctype, docname, sync_log_name, error, error_type, attempts=retry_count)
+
+# Add other utility functions as needed, e.g., for communication
@@ -0,0 +1,95 @@
+import hashlib
+import hmac
+
+import frappe
+from frappe import _
+
+# Redis key (site-prefixed through frappe.cache().make_key) bumped whenever the settings change
+AUTH_VERSION_KEY = "flyout_auth_version"
+
+# Request header carrying the HMAC-SHA256 of the raw request body, hex encoded ("sha256=" prefix optional)
+SIGNATURE_HEADER = "X-FlyOut-Signature"
+
+# Per-worker cache of derived verifiers, keyed by site
+_verifiers = {}
+
+
+def _hash(value):
+    return hashlib.sha256(value.encode()).digest()
+
+
+def invalidate_verifier():
+    """Make every worker rebuild its verifier on the next webhook (call when the settings change)"""
+    frappe.cache().incr(frappe.cache().make_key(AUTH_VERSION_KEY))
+    _verifiers.pop(frappe.local.site, None)
+
+
+def get_verifier():
+    """
+    Return this worker's verifier for the current site, rebuilding it if the settings changed.
+
+    Only a SHA-256 of the API key is kept; the webhook secret is kept as is
+    because HMAC needs it. Checking the version costs one Redis GET, the
+    settings document and the password table are only read on a rebuild.
+
+    Returns:
+        frappe._dict: enable_sync, api_key_hash and webhook_secret.
+    """
+    version = frappe.cache().get(frappe.cache().make_key(AUTH_VERSION_KEY))
+    verifier = _verifiers.get(frappe.local.site)
+    if verifier and verifier.version == version:
+        return verifier
+
+    settings = frappe.get_doc("FlyOut Account Settings")
+    api_key = settings.get_password("api_key", raise_exception=False)
+    webhook_secret = settings.get_password("webhook_secret", raise_exception=False)
+
+    verifier = _verifiers[frappe.local.site] = frappe._dict(
+        version=version,
+        enable_sync=settings.enable_sync,
+        api_key_hash=_hash(api_key) if api_key else None,
+        webhook_secret=webhook_secret.encode() if webhook_secret else None
+    )
+    return verifier
+
+
+def verify_token(token):
+    """
+    Authenticate an inbound FlyOut call.
+
+    The token is compared in constant time against the cached key hash. If a
+    webhook secret is configured, the request must also carry a valid
+    X-FlyOut-Signature over its raw body.
+
+    Raises:
+        frappe.AuthenticationError: If the token or signature is missing or wrong.
+        frappe.ValidationError: If synchronization is disabled.
+    """
+    if not token:
+        frappe.throw(_("Authentication token is required"), frappe.AuthenticationError)
+
+    verifier = get_verifier()
+
+    # Check if sync is enabled first
+    if not verifier.enable_sync:
+        frappe.throw(_("Synchronization is disabled in FlyOut Account Settings"), frappe.ValidationError)
+
+    if not verifier.api_key_hash or not hmac.compare_digest(_hash(token), verifier.api_key_hash):
+        frappe.throw(_("Invalid authentication token"), frappe.AuthenticationError)
+
+    if verifier.webhook_secret:
+        verify_signature(verifier.webhook_secret)
+
+
+def verify_signature(secret):
+    """Check the HMAC-SHA256 signature of the current request body"""
+    signature = frappe.get_request_header(SIGNATURE_HEADER) if frappe.request else None
+    if not signature:
+        frappe.throw(_("Webhook signature is required"), frappe.AuthenticationError)
+
+    if signature.startswith("sha256="):
+        signature = signature[len("sha256="):]
+
+    expected = hmac.new(secret, frappe.request.get_data(cache=True), hashlib.sha256).hexdigest()
+    if not hmac.compare_digest(signature.strip().lower(), expected):
+        frappe.throw(_("Invalid webhook signature"), frappe.AuthenticationError)
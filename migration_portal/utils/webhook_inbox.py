@@ -0,0 +1,275 @@
+import json
+
+import frappe
+from frappe import _
+from frappe.utils import now_datetime, add_to_date, cint
+
+from migration_portal.migration_portal.utils.event_ordering import (
+    get_event_timestamp, is_stale_event, record_applied_version, stale_response
+)
+
+# Background queue the inbox consumer runs on
+INBOX_WORKER_QUEUE = "default"
+
+# Number of inbox entries claimed per transaction by the consumer
+INBOX_BATCH_SIZE = 200
+
+# Entries stuck in "Processing" longer than this (minutes) are assumed orphaned by a dead worker
+STALE_PROCESSING_MINUTES = 30
+
+# Attempts per entry before it is left as Failed. FlyOut was already answered with
+# 202 and its redelivery is deduplicated, so the inbox retries on its behalf.
+MAX_INBOX_ATTEMPTS = 5
+
+# Delay (minutes) before the first retry; doubled for every further attempt
+INBOX_RETRY_BACKOFF_MINUTES = 1
+
+# Webhook endpoint label recorded on the Sync Logs of each event type
+EVENT_ENDPOINTS = {
+    "Inquiry": "inquiry",
+    "Status Update": "status"
+}
+
+
+def is_deferred_mode(settings=None):
+    """Return True if FlyOut webhooks should be stored and acknowledged instead of applied inline"""
+    if not settings:
+        settings = frappe.get_cached_doc("FlyOut Account Settings")
+    return settings.get("webhook_processing_mode") == "Deferred"
+
+
+def store_webhook_event(event_type, data):
+    """
+    Persist a verified FlyOut webhook to the inbox and acknowledge it.
+
+    Only one row is written in the request; the consumer is started once the
+    request commits. FlyOut gets a 202 Accepted, so a slow or failing apply
+    never makes it time out and resend.
+
+    Args:
+        event_type (str): "Inquiry" or "Status Update".
+        data (dict): Validated webhook payload.
+
+    Returns:
+        dict: Acknowledgement with the inbox entry name.
+    """
+    entry = frappe.get_doc({
+        "doctype": "FlyOut Webhook Inbox",
+        "event_type": event_type,
+        "flyout_inquiry_id": data.get("inquiry_id"),
+        "payload": json.dumps(data),
+        "status": "Pending",
+        "received_at": now_datetime(),
+        "not_before": now_datetime()
+    })
+    entry.insert(ignore_permissions=True)
+
+    wake_inbox_worker()
+
+    frappe.local.response.http_status_code = 202
+    return {
+        "success": True,
+        "message": "Webhook accepted for processing",
+        "inbox_entry": entry.name
+    }
+
+
+def wake_inbox_worker():
+    """Enqueue the inbox consumer once the current transaction commits (no-op if one is already queued)"""
+    frappe.enqueue(
+        "migration_portal.migration_portal.utils.webhook_inbox.process_webhook_inbox",
+        queue=INBOX_WORKER_QUEUE,
+        job_id=f"flyout_webhook_inbox::{frappe.local.site}",
+        deduplicate=True,
+        enqueue_after_commit=True
+    )
+
+
+def run_webhook_inbox():
+    """
+    Scheduler entry point: release entries orphaned by a crashed worker and
+    start the consumer for whatever is still pending.
+
+    The consumer is started through the deduplicated job rather than run
+    inline, so there is never more than one and events for an inquiry are
+    applied in the order they arrived.
+    """
+    requeue_stale_entries()
+    if get_due_entries(limit=1):
+        wake_inbox_worker()
+
+
+def process_webhook_inbox(batch_size=INBOX_BATCH_SIZE):
+    """
+    Background job: apply pending FlyOut webhooks in arrival order, in batches.
+
+    Each entry is applied in its own savepoint so one bad payload does not
+    roll back the rest of the batch; the batch's Sync Logs are written in one
+    statement and the batch is committed once. A failed entry goes back to
+    Pending with an exponential backoff and is left as Failed once it has
+    been attempted MAX_INBOX_ATTEMPTS times.
+
+    Args:
+        batch_size (int, optional): Number of entries claimed per transaction.
+    """
+    from migration_portal.migration_portal.api.flyout import build_sync_log, bulk_insert_sync_logs, get_inbound_endpoint
+
+    endpoints = {event_type: get_inbound_endpoint(path) for event_type, path in EVENT_ENDPOINTS.items()}
+
+    while True:
+        entries = claim_pending_entries(batch_size)
+        if not entries:
+            break
+
+        sync_logs = []
+        processed = []
+
+        # Set the in_sync flag to prevent recursive sync
+        frappe.flags.in_sync = True
+
+        try:
+            for idx, entry in enumerate(entries):
+                savepoint = f"flyout_inbox_{idx}"
+                frappe.db.savepoint(savepoint)
+
+                data = None
+                docname = None
+                try:
+                    data = json.loads(entry.payload)
+                    docname, response_data = apply_webhook_event(entry.event_type, data)
+
+                    sync_logs.append(build_sync_log(
+                        "Inbound", "Success", "Inquiry", docname, entry.flyout_inquiry_id, data,
+                        response_data=response_data, endpoint=endpoints[entry.event_type], method="Webhook"
+                    ))
+                    processed.append(entry.name)
+                except Exception as e:
+                    frappe.db.rollback(save_point=savepoint)
+
+                    sync_logs.append(build_sync_log(
+                        "Inbound", "Error", "Inquiry", docname, entry.flyout_inquiry_id, data or entry.payload,
+                        error_message=str(e), endpoint=endpoints[entry.event_type], method="Webhook"
+                    ))
+                    mark_entry_failed(entry, str(e))
+        finally:
+            # Reset the in_sync flag
+            frappe.flags.in_sync = False
+
+        if processed:
+            frappe.db.set_value(
+                "FlyOut Webhook Inbox",
+                {"name": ["in", processed]},
+                {"status": "Processed", "processed_at": now_datetime()}
+            )
+
+        # Write the batch's Sync Log rows in one statement and close the transaction
+        bulk_insert_sync_logs(sync_logs)
+        frappe.db.commit()
+
+        if len(entries) < batch_size:
+            break
+
+
+def apply_webhook_event(event_type, data):
+    """
+    Apply one stored webhook exactly as the synchronous endpoint would.
+
+    Returns:
+        tuple: (Inquiry name, response data for the Sync Log or None)
+
+    Raises:
+        frappe.ValidationError: If the payload cannot be applied.
+    """
+    from migration_portal.migration_portal.api.flyout import (
+        apply_inquiry_payload, apply_status_update, validate_inquiry_payload, validate_status_payload
+    )
+
+    if event_type == "Inquiry":
+        validate_inquiry_payload(data)
+    else:
+        validate_status_payload(data)
+
+    # Drop events older than the applied state (locks the inquiry until the batch commits)
+    event_ts = get_event_timestamp(data)
+    stale = is_stale_event(data["inquiry_id"], event_ts)
+
+    existing = frappe.db.get_value("Inquiry", {"flyout_inquiry_id": data["inquiry_id"]})
+    if stale:
+        return existing, stale_response(data)
+
+    if event_type == "Inquiry":
+        inquiry_name = apply_inquiry_payload(data, existing).name
+        record_applied_version(inquiry_name, data["inquiry_id"], event_ts)
+        return inquiry_name, None
+
+    if not existing:
+        frappe.throw(_("Inquiry with FlyOut ID {0} not found").format(data["inquiry_id"]))
+
+    changed = apply_status_update(data, existing)
+    record_applied_version(existing, data["inquiry_id"], event_ts)
+    if changed:
+        return existing, None
+    return existing, {"message": "No status change applied or mapping not found."}
+
+
+def mark_entry_failed(entry, error):
+    """Schedule a failed entry for another attempt, or leave it as Failed once attempts run out"""
+    attempts = cint(entry.attempts) + 1
+    values = {"attempts": attempts, "error_message": error}
+
+    if attempts < MAX_INBOX_ATTEMPTS:
+        values["status"] = "Pending"
+        values["not_before"] = add_to_date(
+            now_datetime(), minutes=INBOX_RETRY_BACKOFF_MINUTES * 2 ** (attempts - 1)
+        )
+    else:
+        values["status"] = "Failed"
+        values["processed_at"] = now_datetime()
+        frappe.log_error(
+            f"FlyOut webhook {entry.name} ({entry.event_type}) failed {attempts} times and was given up: {error}",
+            "FlyOut Webhook Inbox Error"
+        )
+
+    frappe.db.set_value("FlyOut Webhook Inbox", entry.name, values)
+
+
+def get_due_entries(limit, for_update=False):
+    """Pending entries whose next attempt is due, oldest first"""
+    return frappe.get_all(
+        "FlyOut Webhook Inbox",
+        filters={"status": "Pending"},
+        # Entries stored before retries existed have no not_before
+        or_filters=[["not_before", "<=", now_datetime()], ["not_before", "is", "not set"]],
+        fields=["name", "event_type", "flyout_inquiry_id", "payload", "attempts"],
+        order_by="creation asc",
+        limit=limit,
+        for_update=for_update
+    )
+
+
+def claim_pending_entries(batch_size):
+    """Lock the oldest batch of due pending entries, mark them as Processing and commit"""
+    entries = get_due_entries(batch_size, for_update=True)
+
+    if entries:
+        frappe.db.set_value(
+            "FlyOut Webhook Inbox",
+            {"name": ["in", [e.name for e in entries]]},
+            "status",
+            "Processing"
+        )
+    frappe.db.commit()
+
+    return entries
+
+
+def requeue_stale_entries():
+    """Put entries left in Processing by a dead worker back to Pending"""
+    cutoff = add_to_date(now_datetime(), minutes=-STALE_PROCESSING_MINUTES)
+    frappe.db.set_value(
+        "FlyOut Webhook Inbox",
+        {"status": "Processing", "modified": ["<", cutoff]},
+        "status",
+        "Pending"
+    )
+    frappe.db.commit()